@@ -0,0 +1,72 @@
+"""
+Market data models
+"""
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+
+class StockSummary(BaseModel):
+    """Stock metadata"""
+    symbol: str
+    name: str
+    sector: Optional[str] = None
+    market_cap: Optional[float] = None
+    currency: Optional[str] = None
+
+
+class StockListResponse(BaseModel):
+    """Page of stocks"""
+    items: List[StockSummary]
+    next_cursor: Optional[str] = Field(None, description="Pass as `after` to fetch the next page")
+
+
+class PricePoint(BaseModel):
+    """Single price observation (OHLCV omitted when downsampled)"""
+    date: datetime
+    close: float
+    adjusted_close: Optional[float] = None
+    open: Optional[float] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+    volume: Optional[int] = None
+
+
+class PriceHistoryResponse(BaseModel):
+    """Price history of a stock"""
+    symbol: str
+    points: List[PricePoint]
+    next_cursor: Optional[datetime] = Field(None, description="Pass as `after` to fetch the next page")
+    downsampled: bool = Field(False, description="Points were reduced with LTTB")
+
+
+class OPCVMSummary(BaseModel):
+    """Latest known data of an OPCVM"""
+    opcvm_id: str
+    name: str
+    category: Optional[str] = None
+    nav: Optional[float] = None
+    date: datetime
+    performance_1y: Optional[float] = None
+    performance_3y: Optional[float] = None
+    performance_5y: Optional[float] = None
+
+
+class OPCVMListResponse(BaseModel):
+    """Page of OPCVM"""
+    items: List[OPCVMSummary]
+    next_cursor: Optional[str] = Field(None, description="Pass as `after` to fetch the next page")
+
+
+class NAVPoint(BaseModel):
+    """Single net asset value observation"""
+    date: datetime
+    nav: float
+
+
+class OPCVMPerformanceResponse(BaseModel):
+    """NAV history of an OPCVM"""
+    opcvm_id: str
+    points: List[NAVPoint]
+    next_cursor: Optional[datetime] = Field(None, description="Pass as `after` to fetch the next page")
+    downsampled: bool = Field(False, description="Points were reduced with LTTB")
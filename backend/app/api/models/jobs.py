@@ -0,0 +1,37 @@
+"""
+Job models
+"""
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+from enum import Enum
+
+
+class JobType(str, Enum):
+    """Long-running computations that can be submitted as jobs"""
+    MEAN_VARIANCE = "mean_variance"
+    CVAR = "cvar"
+    ROBUST = "robust"
+    HRP = "hrp"
+    RISK_PARITY = "risk_parity"
+    EFFICIENT_FRONTIER = "efficient_frontier"
+    STRESS_TEST = "stress_test"
+    PORTFOLIO_ANALYTICS = "portfolio_analytics"
+
+
+class JobSubmitRequest(BaseModel):
+    """Job submission request"""
+    type: JobType = Field(..., description="Computation to run")
+    payload: Dict[str, Any] = Field(..., description="Request body of the matching endpoint")
+
+
+class JobResponse(BaseModel):
+    """Job state"""
+    job_id: str = Field(..., description="Job identifier (identical requests share it)")
+    type: JobType
+    status: str = Field(..., description="queued, running, completed or failed")
+    progress: float = Field(0.0, description="Progress between 0 and 1")
+    message: Optional[str] = None
+    result: Optional[Any] = Field(None, description="Result once completed")
+    error: Optional[str] = Field(None, description="Error message if failed")
+    created_at: float
+    updated_at: float
@@ -1,7 +1,7 @@
 """
 Optimization models
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import List, Optional
 from enum import Enum
 
@@ -11,6 +11,8 @@ class OptimizationMethod(str, Enum):
     MEAN_VARIANCE = "mean_variance"
     CVAR = "cvar"
     ROBUST = "robust"
+    HRP = "hrp"  # Hierarchical Risk Parity
+    RISK_PARITY = "risk_parity"  # Equal Risk Contribution
 
 
 class ConstraintType(str, Enum):
@@ -42,6 +44,9 @@ class OptimizationRequest(BaseModel):
     # Robust optimization
     uncertainty_radius: Optional[float] = Field(None, description="Uncertainty radius for robust optimization")
     
+    # Risk parity
+    risk_budgets: Optional[List[float]] = Field(None, description="Risk budget per asset for risk parity (default: equal)")
+    
     # Data period
     lookback_period: int = Field(252, description="Lookback period in days (default: 1 year)")
     use_ledoit_wolf: bool = Field(True, description="Use Ledoit-Wolf shrinkage for covariance estimation")
@@ -55,7 +60,7 @@ class OptimizationResponse(BaseModel):
     sharpe_ratio: Optional[float] = Field(None, description="Sharpe ratio")
     cvar: Optional[float] = Field(None, description="Conditional Value at Risk")
     var: Optional[float] = Field(None, description="Value at Risk")
-    diversification_ratio: Optional[float] = Field(None, description="Diversification ratio (1/HHI)")
+    diversification_ratio: Optional[float] = Field(None, description="Diversification ratio (weighted average volatility / portfolio volatility)")
     method_used: str = Field(..., description="Optimization method used")
 
 
@@ -65,6 +70,13 @@ class EfficientFrontierRequest(BaseModel):
     num_points: int = Field(50, description="Number of points on efficient frontier")
     lookback_period: int = Field(252, description="Lookback period in days")
     use_ledoit_wolf: bool = Field(True, description="Use Ledoit-Wolf shrinkage")
+    max_weight: float = Field(1.0, description="Maximum weight per asset")
+    min_weight: float = Field(0.0, description="Minimum weight per asset")
+    
+    # Resampled (Michaud) frontier
+    resampled: bool = Field(False, description="Average frontiers over bootstrap samples of the returns")
+    num_samples: int = Field(100, ge=1, le=2000, description="Number of bootstrap samples")
+    seed: int = Field(42, description="Random seed for reproducible resampling")
 
 
 class EfficientFrontierPoint(BaseModel):
@@ -80,3 +92,41 @@ class EfficientFrontierResponse(BaseModel):
     min_variance_return: float = Field(..., description="Return of minimum variance portfolio")
     min_variance_volatility: float = Field(..., description="Volatility of minimum variance portfolio")
 
+
+
+class PortfolioAnalyticsRequest(BaseModel):
+    """Batch risk analytics request for existing portfolios"""
+    symbols: List[str] = Field(..., description="List of asset symbols (column order of the weights)")
+    portfolios: List[List[float]] = Field(..., description="Weight vectors, one per portfolio")
+    alpha: float = Field(0.05, description="Tail probability for VaR/CVaR (e.g., 0.05 for 95%)")
+    lookback_period: int = Field(252, description="Lookback period in days")
+    use_ledoit_wolf: bool = Field(True, description="Use Ledoit-Wolf shrinkage")
+    include_contributions: bool = Field(True, description="Return per-asset marginal and component risk")
+    
+    @model_validator(mode='after')
+    def check_weight_lengths(self):
+        n = len(self.symbols)
+        bad = [i for i, weights in enumerate(self.portfolios) if len(weights) != n]
+        if bad:
+            raise ValueError(f"Portfolios {bad[:10]} do not have one weight per symbol ({n})")
+        return self
+
+
+class PortfolioRiskMetrics(BaseModel):
+    """Risk metrics of a single portfolio"""
+    expected_return: float = Field(..., description="Expected daily return")
+    volatility: float = Field(..., description="Daily volatility")
+    sharpe_ratio: Optional[float] = Field(None, description="Annualized Sharpe ratio")
+    var: Optional[float] = Field(None, description="Historical Value at Risk (daily loss)")
+    cvar: Optional[float] = Field(None, description="Historical Conditional Value at Risk (daily loss)")
+    diversification_ratio: Optional[float] = Field(None, description="Weighted average volatility / portfolio volatility")
+    hhi: Optional[float] = Field(None, description="Herfindahl-Hirschman Index of the normalized weights (None for zero-net portfolios)")
+    marginal_risk: Optional[List[float]] = Field(None, description="Marginal contribution to volatility per asset")
+    risk_contributions: Optional[List[float]] = Field(None, description="Component contribution to volatility per asset")
+
+
+class PortfolioAnalyticsResponse(BaseModel):
+    """Batch risk analytics response"""
+    symbols: List[str]
+    num_scenarios: int = Field(..., description="Number of historical scenarios used for VaR/CVaR")
+    portfolios: List[PortfolioRiskMetrics]
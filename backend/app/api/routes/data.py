@@ -0,0 +1,118 @@
+"""
+Market data endpoints
+"""
+import hashlib
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from app.api.models.data import (
+    StockListResponse,
+    PriceHistoryResponse,
+    OPCVMListResponse,
+    OPCVMPerformanceResponse
+)
+from app.api.services.data_service import DataService
+from app.database.models import get_async_db
+
+if TYPE_CHECKING:
+    # Imported lazily at runtime (needs greenlet), like get_async_session_factory
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter()
+data_service = DataService()
+
+MAX_PAGE_SIZE = 5000
+MAX_CHART_POINTS = 5000
+
+
+async def _etag(request: Request, db: "AsyncSession", *datasets: str) -> str:
+    """ETag from the dataset versions and the full request URL"""
+    version = await data_service.data_version(db, *datasets)
+    digest = hashlib.sha1(f"{version}|{request.url.path}?{request.url.query}".encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    candidates = request.headers.get("if-none-match", "")
+    return etag in [tag.strip() for tag in candidates.split(",")] or candidates.strip() == "*"
+
+
+def _set_cache_headers(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+
+@router.get("/stocks", response_model=StockListResponse)
+async def list_stocks(
+    request: Request,
+    response: Response,
+    after: Optional[str] = Query(None, description="Cursor: last symbol of the previous page"),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    db: "AsyncSession" = Depends(get_async_db)
+):
+    """
+    List stocks (keyset pagination by symbol)
+    """
+    etag = await _etag(request, db, "stock_info")
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    _set_cache_headers(response, etag)
+    return await data_service.list_stocks(db, after, limit)
+
+
+@router.get("/stocks/{symbol}/history", response_model=PriceHistoryResponse)
+async def get_stock_history(
+    symbol: str,
+    request: Request,
+    response: Response,
+    start: Optional[datetime] = Query(None, description="First date (inclusive)"),
+    end: Optional[datetime] = Query(None, description="Last date (inclusive)"),
+    after: Optional[datetime] = Query(None, description="Cursor: last date of the previous page"),
+    limit: int = Query(1000, ge=1, le=MAX_PAGE_SIZE),
+    points: Optional[int] = Query(None, ge=3, le=MAX_CHART_POINTS, description="Downsample the range to this many points (LTTB)"),
+    db: "AsyncSession" = Depends(get_async_db)
+):
+    """
+    Price history of a stock, paginated or downsampled for charts
+    """
+    etag = await _etag(request, db, "stock_prices")
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    result = await data_service.stock_history(db, symbol.upper(), start, end, after, limit, points)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No price data for {symbol}")
+    _set_cache_headers(response, etag)
+    return result
+
+
+@router.get("/opcvm", response_model=OPCVMListResponse)
+async def list_opcvm(
+    after: Optional[str] = Query(None, description="Cursor: last opcvm_id of the previous page"),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    db: "AsyncSession" = Depends(get_async_db)
+):
+    """
+    List OPCVM with their latest NAV and performance
+    """
+    # No ETag: nothing writes OPCVM data or bumps its version yet
+    return await data_service.list_opcvm(db, after, limit)
+
+
+@router.get("/opcvm/{opcvm_id}/performance", response_model=OPCVMPerformanceResponse)
+async def get_opcvm_performance(
+    opcvm_id: str,
+    start: Optional[datetime] = Query(None, description="First date (inclusive)"),
+    end: Optional[datetime] = Query(None, description="Last date (inclusive)"),
+    after: Optional[datetime] = Query(None, description="Cursor: last date of the previous page"),
+    limit: int = Query(1000, ge=1, le=MAX_PAGE_SIZE),
+    points: Optional[int] = Query(None, ge=3, le=MAX_CHART_POINTS, description="Downsample the range to this many points (LTTB)"),
+    db: "AsyncSession" = Depends(get_async_db)
+):
+    """
+    NAV history of an OPCVM, paginated or downsampled for charts
+    """
+    result = await data_service.opcvm_performance(db, opcvm_id, start, end, after, limit, points)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No data for OPCVM {opcvm_id}")
+    return result
@@ -0,0 +1,82 @@
+"""
+Asynchronous job endpoints
+"""
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from app.api.models.jobs import JobSubmitRequest, JobResponse
+from app.jobs import JobQueue, JobRecord, JobStatus, get_job_queue
+from app.jobs.tasks import normalize_payload
+
+router = APIRouter()
+
+EVENT_POLL_INTERVAL = 0.5
+
+
+def _to_response(job: JobRecord) -> JobResponse:
+    return JobResponse(
+        job_id=job.job_id,
+        type=job.job_type,
+        status=job.status.value,
+        progress=job.progress,
+        message=job.message,
+        result=job.result,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at
+    )
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(request: JobSubmitRequest, queue: JobQueue = Depends(get_job_queue)):
+    """
+    Submit a long-running computation; identical in-flight requests share one job
+    """
+    try:
+        payload = normalize_payload(request.type.value, request.payload)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+    try:
+        job = await asyncio.to_thread(queue.submit, request.type.value, payload)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Job queue unavailable: {e}")
+    return _to_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, queue: JobQueue = Depends(get_job_queue)):
+    """
+    Poll job status, progress and result
+    """
+    job = await asyncio.to_thread(queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return _to_response(job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, queue: JobQueue = Depends(get_job_queue)):
+    """
+    Subscribe to job progress as Server-Sent Events until it finishes
+    """
+    job = await asyncio.to_thread(queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+
+    async def stream():
+        last_update = None
+        current = job
+        while current is not None:
+            if current.updated_at != last_update:
+                last_update = current.updated_at
+                data = _to_response(current).model_dump_json()
+                yield f"event: {current.status.value}\ndata: {data}\n\n"
+            if current.status in (JobStatus.COMPLETED, JobStatus.FAILED):
+                return
+            await asyncio.sleep(EVENT_POLL_INTERVAL)
+            current = await asyncio.to_thread(queue.get, job_id)
+        yield f"event: expired\ndata: {json.dumps({'job_id': job_id})}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
@@ -7,7 +7,9 @@ from app.api.models.optimization import (
     OptimizationRequest,
     OptimizationResponse,
     EfficientFrontierRequest,
-    EfficientFrontierResponse
+    EfficientFrontierResponse,
+    PortfolioAnalyticsRequest,
+    PortfolioAnalyticsResponse
 )
 from app.api.services.optimization_service import OptimizationService
 
@@ -51,6 +53,30 @@ async def optimize_robust(request: OptimizationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/optimize/hrp", response_model=OptimizationResponse)
+async def optimize_hrp(request: OptimizationRequest):
+    """
+    Allocate portfolio using Hierarchical Risk Parity (no solver)
+    """
+    try:
+        result = await optimization_service.optimize_hrp(request)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/optimize/risk-parity", response_model=OptimizationResponse)
+async def optimize_risk_parity(request: OptimizationRequest):
+    """
+    Allocate portfolio using Equal Risk Contribution (no solver)
+    """
+    try:
+        result = await optimization_service.optimize_risk_parity(request)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/efficient-frontier", response_model=EfficientFrontierResponse)
 async def get_efficient_frontier(request: EfficientFrontierRequest):
     """
@@ -63,6 +89,18 @@ async def get_efficient_frontier(request: EfficientFrontierRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/analytics/portfolios", response_model=PortfolioAnalyticsResponse)
+async def analyze_portfolios(request: PortfolioAnalyticsRequest):
+    """
+    Risk decomposition, VaR/CVaR and concentration for many portfolios at once
+    """
+    try:
+        result = await optimization_service.analyze_portfolios(request)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/stress-test")
 async def stress_test(request: OptimizationRequest):
     """
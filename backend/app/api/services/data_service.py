@@ -0,0 +1,232 @@
+"""
+Data service - Serves stored market data
+
+Every history query filters on (symbol, date) or (opcvm_id, date) so it is
+answered from idx_symbol_date / idx_opcvm_date, and pages are keyset
+based (`date > after`) so deep pages cost the same as the first one.
+"""
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+from sqlalchemy import func, select
+
+from app.api.models.data import (
+    StockSummary,
+    StockListResponse,
+    PricePoint,
+    PriceHistoryResponse,
+    OPCVMSummary,
+    OPCVMListResponse,
+    NAVPoint,
+    OPCVMPerformanceResponse
+)
+from app.database.models import StockInfo, StockPrice, OPCVMData, DataVersion
+from app.utils.downsampling import lttb_indices
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class DataService:
+    """Service for market data queries"""
+
+    async def data_version(self, db: "AsyncSession", *names: str) -> str:
+        """Combined version of the datasets a response depends on"""
+        rows = (await db.execute(
+            select(DataVersion.name, DataVersion.version).where(DataVersion.name.in_(names))
+        )).all()
+        versions = dict(rows)
+        return "-".join(str(versions.get(name, 0)) for name in names)
+
+    async def list_stocks(self, db: "AsyncSession", after: Optional[str], limit: int) -> StockListResponse:
+        """Stocks ordered by symbol"""
+        query = select(StockInfo).order_by(StockInfo.symbol).limit(limit + 1)
+        if after is not None:
+            query = query.where(StockInfo.symbol > after)
+        rows = (await db.execute(query)).scalars().all()
+
+        items = [
+            StockSummary(
+                symbol=row.symbol,
+                name=row.name,
+                sector=row.sector,
+                market_cap=row.market_cap,
+                currency=row.currency
+            )
+            for row in rows[:limit]
+        ]
+        next_cursor = items[-1].symbol if len(rows) > limit else None
+        return StockListResponse(items=items, next_cursor=next_cursor)
+
+    async def stock_history(
+        self,
+        db: "AsyncSession",
+        symbol: str,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        after: Optional[datetime],
+        limit: int,
+        points: Optional[int]
+    ) -> Optional[PriceHistoryResponse]:
+        """
+        Price history of a symbol, paginated or downsampled to `points`
+
+        Returns:
+            None if the symbol has no prices at all
+        """
+        conditions = [StockPrice.symbol == symbol]
+        if start is not None:
+            conditions.append(StockPrice.date >= start)
+        if end is not None:
+            conditions.append(StockPrice.date <= end)
+
+        if points is not None:
+            # Only the columns the chart needs; the whole range is reduced
+            # server-side on the adjusted series (raw close where unadjusted)
+            rows = (await db.execute(
+                select(StockPrice.date, StockPrice.close, StockPrice.adjusted_close)
+                .where(*conditions).order_by(StockPrice.date)
+            )).all()
+            if not rows and not await self._symbol_exists(db, symbol):
+                return None
+            keep = self._downsample_indices(
+                [r[0] for r in rows],
+                [r[1] if r[2] is None else r[2] for r in rows],
+                points
+            )
+            return PriceHistoryResponse(
+                symbol=symbol,
+                points=[
+                    PricePoint(date=rows[i][0], close=rows[i][1], adjusted_close=rows[i][2])
+                    for i in keep
+                ],
+                downsampled=len(keep) < len(rows)
+            )
+
+        if after is not None:
+            conditions.append(StockPrice.date > after)
+        rows = (await db.execute(
+            select(StockPrice).where(*conditions).order_by(StockPrice.date).limit(limit + 1)
+        )).scalars().all()
+        if not rows and not await self._symbol_exists(db, symbol):
+            return None
+
+        page = rows[:limit]
+        return PriceHistoryResponse(
+            symbol=symbol,
+            points=[
+                PricePoint(
+                    date=row.date,
+                    close=row.close,
+                    adjusted_close=row.adjusted_close,
+                    open=row.open,
+                    high=row.high,
+                    low=row.low,
+                    volume=row.volume
+                )
+                for row in page
+            ],
+            next_cursor=page[-1].date if len(rows) > limit else None
+        )
+
+    async def list_opcvm(self, db: "AsyncSession", after: Optional[str], limit: int) -> OPCVMListResponse:
+        """Latest record of each OPCVM, ordered by id"""
+        latest = select(
+            OPCVMData.opcvm_id,
+            func.max(OPCVMData.date).label("max_date")
+        ).group_by(OPCVMData.opcvm_id)
+        if after is not None:
+            latest = latest.where(OPCVMData.opcvm_id > after)
+        latest = latest.order_by(OPCVMData.opcvm_id).limit(limit + 1).subquery()
+
+        rows = (await db.execute(
+            select(OPCVMData)
+            .join(latest, (OPCVMData.opcvm_id == latest.c.opcvm_id) & (OPCVMData.date == latest.c.max_date))
+            .order_by(OPCVMData.opcvm_id)
+        )).scalars().all()
+
+        # Duplicate rows on the same latest date collapse to one entry per fund
+        unique = list({row.opcvm_id: row for row in rows}.values())
+        items = [
+            OPCVMSummary(
+                opcvm_id=row.opcvm_id,
+                name=row.name,
+                category=row.category,
+                nav=row.nav,
+                date=row.date,
+                performance_1y=row.performance_1y,
+                performance_3y=row.performance_3y,
+                performance_5y=row.performance_5y
+            )
+            for row in unique[:limit]
+        ]
+        next_cursor = items[-1].opcvm_id if len(unique) > limit else None
+        return OPCVMListResponse(items=items, next_cursor=next_cursor)
+
+    async def opcvm_performance(
+        self,
+        db: "AsyncSession",
+        opcvm_id: str,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        after: Optional[datetime],
+        limit: int,
+        points: Optional[int]
+    ) -> Optional[OPCVMPerformanceResponse]:
+        """NAV history of an OPCVM, paginated or downsampled to `points`"""
+        conditions = [OPCVMData.opcvm_id == opcvm_id, OPCVMData.nav.isnot(None)]
+        if start is not None:
+            conditions.append(OPCVMData.date >= start)
+        if end is not None:
+            conditions.append(OPCVMData.date <= end)
+        if points is None and after is not None:
+            conditions.append(OPCVMData.date > after)
+
+        query = select(OPCVMData.date, OPCVMData.nav).where(*conditions).order_by(OPCVMData.date)
+        if points is None:
+            query = query.limit(limit + 1)
+        rows = (await db.execute(query)).all()
+        if not rows:
+            exists = (await db.execute(
+                select(OPCVMData.id).where(OPCVMData.opcvm_id == opcvm_id).limit(1)
+            )).first()
+            if exists is None:
+                return None
+
+        if points is not None:
+            dates, values = self._downsample(rows, points)
+            return OPCVMPerformanceResponse(
+                opcvm_id=opcvm_id,
+                points=[NAVPoint(date=d, nav=v) for d, v in zip(dates, values)],
+                downsampled=len(dates) < len(rows)
+            )
+
+        page = rows[:limit]
+        return OPCVMPerformanceResponse(
+            opcvm_id=opcvm_id,
+            points=[NAVPoint(date=d, nav=v) for d, v in page],
+            next_cursor=page[-1][0] if len(rows) > limit else None
+        )
+
+    @staticmethod
+    async def _symbol_exists(db: "AsyncSession", symbol: str) -> bool:
+        row = (await db.execute(
+            select(StockPrice.id).where(StockPrice.symbol == symbol).limit(1)
+        )).first()
+        return row is not None
+
+    @staticmethod
+    def _downsample_indices(dates, values, points: int):
+        """Indices of at most `points` (date, value) pairs kept by LTTB"""
+        if len(dates) <= points:
+            return list(range(len(dates)))
+        x = np.array([d.timestamp() for d in dates])
+        y = np.array(values, dtype=float)
+        return lttb_indices(x, y, points).tolist()
+
+    @classmethod
+    def _downsample(cls, rows, points: int):
+        """Reduce (date, value) rows to at most `points` with LTTB"""
+        keep = cls._downsample_indices([r[0] for r in rows], [r[1] for r in rows], points)
+        return [rows[i][0] for i in keep], [float(rows[i][1]) for i in keep]
@@ -1,14 +1,43 @@
 """
 Optimization service - Handles portfolio optimization logic
 """
+import asyncio
+import numpy as np
+import pandas as pd
+from typing import Callable, List, Optional
 from app.api.models.optimization import (
     OptimizationRequest,
     OptimizationResponse,
     EfficientFrontierRequest,
     EfficientFrontierResponse,
-    EfficientFrontierPoint
+    EfficientFrontierPoint,
+    PortfolioAnalyticsRequest,
+    PortfolioAnalyticsResponse,
+    PortfolioRiskMetrics
 )
-from app.utils.optimizers import MeanVarianceOptimizer, CVaROptimizer, RobustOptimizer
+from app.utils.optimizers import (
+    MeanVarianceOptimizer,
+    CVaROptimizer,
+    RobustOptimizer,
+    HRPOptimizer,
+    RiskParityOptimizer
+)
+from app.utils.covariance_estimator import CovarianceEstimator
+from app.utils.returns_builder import load_aligned_returns
+from app.utils.risk_analytics import batch_risk_metrics
+from app.utils.frontier import efficient_frontier, resampled_frontier
+from app.core.config import settings
+from app.database.models import ReadSessionLocal
+
+
+ProgressCallback = Callable[[float, Optional[str]], None]
+
+
+def _stage(progress: Optional[ProgressCallback], start: float, end: float) -> Optional[ProgressCallback]:
+    """Map a step's own 0-1 progress onto [start, end] of the whole job"""
+    if progress is None:
+        return None
+    return lambda fraction, message=None: progress(start + (end - start) * fraction, message)
 
 
 class OptimizationService:
@@ -18,6 +47,78 @@ class OptimizationService:
         self.mv_optimizer = MeanVarianceOptimizer()
         self.cvar_optimizer = CVaROptimizer()
         self.robust_optimizer = RobustOptimizer()
+        self.hrp_optimizer = HRPOptimizer()
+        self.risk_parity_optimizer = RiskParityOptimizer()
+    
+    def _load_returns(self, symbols: List[str], lookback_period: int) -> pd.DataFrame:
+        """
+        Load calendar-aligned daily returns for symbols over the lookback period
+        
+        Unobserved days stay NaN so newly listed or suspended stocks don't
+        truncate the other symbols' history.
+        """
+        db = ReadSessionLocal()
+        try:
+            aligned = load_aligned_returns(db, symbols, lookback_period)
+        finally:
+            db.close()
+        
+        too_short = aligned.observations()
+        too_short = too_short[too_short < 2].index.tolist()
+        if too_short:
+            raise ValueError(f"Not enough price history to estimate risk for: {too_short}")
+        return aligned.returns
+    
+    @staticmethod
+    def _estimate_covariance(returns: pd.DataFrame, use_ledoit_wolf: bool) -> pd.DataFrame:
+        """Estimate covariance matrix"""
+        if use_ledoit_wolf:
+            return CovarianceEstimator.estimate_ledoit_wolf(returns)
+        return CovarianceEstimator.estimate_sample(returns)
+    
+    @staticmethod
+    def _scenarios(returns: pd.DataFrame) -> np.ndarray:
+        """
+        Historical scenarios for VaR/CVaR, one per calendar day in the lookback
+        
+        An unobserved return (suspension, not yet listed) counts as a flat
+        day instead of discarding the date for every other symbol; only
+        days on which no symbol traded are left out.
+        """
+        observed = returns.notna().any(axis=1)
+        return returns[observed].fillna(0.0).values
+    
+    @staticmethod
+    def _finite(value: float):
+        """None for NaN/inf so JSON stays valid"""
+        return float(value) if np.isfinite(value) else None
+    
+    def _build_response(
+        self,
+        weights: np.ndarray,
+        returns: pd.DataFrame,
+        cov: pd.DataFrame,
+        alpha: float,
+        method_used: str
+    ) -> OptimizationResponse:
+        """Optimization response with the risk metrics of the optimal weights"""
+        metrics = batch_risk_metrics(
+            weights,
+            cov.values,
+            CovarianceEstimator.estimate_mean(returns).values,
+            scenarios=self._scenarios(returns),
+            alpha=alpha
+        )
+        return OptimizationResponse(
+            weights=weights.tolist(),
+            expected_return=float(metrics.expected_return[0]),
+            volatility=float(metrics.volatility[0]),
+            sharpe_ratio=self._finite(metrics.sharpe_ratio[0]),
+            var=self._finite(metrics.var[0]),
+            cvar=self._finite(metrics.cvar[0]),
+            diversification_ratio=self._finite(metrics.diversification_ratio[0]),
+            method_used=method_used
+        )
     
     async def optimize_mean_variance(self, request: OptimizationRequest) -> OptimizationResponse:
         """Optimize portfolio using Mean-Variance"""
@@ -49,16 +150,121 @@ class OptimizationService:
             method_used="robust"
         )
     
+    async def optimize_hrp(self, request: OptimizationRequest) -> OptimizationResponse:
+        """Allocate portfolio using Hierarchical Risk Parity"""
+        returns = await asyncio.to_thread(self._load_returns, request.symbols, request.lookback_period)
+        cov = self._estimate_covariance(returns, request.use_ledoit_wolf)
+        weights, _, _ = self.hrp_optimizer.optimize(
+            returns,
+            cov=cov,
+            constraints={'max_weight': request.max_weight, 'min_weight': request.min_weight}
+        )
+        return self._build_response(weights, returns, cov, request.alpha, "hrp")
+    
+    async def optimize_risk_parity(self, request: OptimizationRequest) -> OptimizationResponse:
+        """Allocate portfolio using Equal Risk Contribution"""
+        if request.risk_budgets is not None and len(request.risk_budgets) != len(request.symbols):
+            raise ValueError("risk_budgets must have one entry per symbol")
+        returns = await asyncio.to_thread(self._load_returns, request.symbols, request.lookback_period)
+        cov = self._estimate_covariance(returns, request.use_ledoit_wolf)
+        weights, _, _ = self.risk_parity_optimizer.optimize(
+            returns,
+            cov=cov,
+            risk_budgets=None if request.risk_budgets is None else np.asarray(request.risk_budgets),
+            constraints={'max_weight': request.max_weight, 'min_weight': request.min_weight}
+        )
+        return self._build_response(weights, returns, cov, request.alpha, "risk_parity")
+    
+    def _compute_frontier(
+        self,
+        request: EfficientFrontierRequest,
+        progress: Optional[ProgressCallback] = None
+    ) -> EfficientFrontierResponse:
+        if progress is not None:
+            progress(0.0, "loading returns")
+        returns = self._load_returns(request.symbols, request.lookback_period)
+        cov = self._estimate_covariance(returns, request.use_ledoit_wolf).values
+        mu = CovarianceEstimator.estimate_mean(returns).values
+        
+        if request.resampled:
+            weights = resampled_frontier(
+                returns.values,
+                request.num_points,
+                num_samples=request.num_samples,
+                seed=request.seed,
+                min_weight=request.min_weight,
+                max_weight=request.max_weight,
+                workers=settings.FRONTIER_RESAMPLING_WORKERS or None,
+                progress=_stage(progress, 0.1, 0.95)
+            )
+        else:
+            weights = efficient_frontier(
+                mu,
+                cov,
+                request.num_points,
+                min_weight=request.min_weight,
+                max_weight=request.max_weight
+            )
+        
+        # Every frontier is evaluated on the full-sample estimates
+        point_returns = weights @ mu
+        point_vols = np.sqrt(np.einsum('pn,nm,pm->p', weights, cov, weights))
+        points = [
+            EfficientFrontierPoint(return_value=float(r), volatility=float(v), weights=w.tolist())
+            for r, v, w in zip(point_returns, point_vols, weights)
+        ]
+        min_idx = int(np.argmin(point_vols))
+        return EfficientFrontierResponse(
+            points=points,
+            min_variance_return=float(point_returns[min_idx]),
+            min_variance_volatility=float(point_vols[min_idx])
+        )
+    
     async def calculate_efficient_frontier(
         self, 
-        request: EfficientFrontierRequest
+        request: EfficientFrontierRequest,
+        progress: Optional[ProgressCallback] = None
     ) -> EfficientFrontierResponse:
-        """Calculate efficient frontier"""
-        # TODO: Implement
-        return EfficientFrontierResponse(
-            points=[],
-            min_variance_return=0.0,
-            min_variance_volatility=0.0
+        """Calculate efficient frontier (point estimate or resampled)"""
+        return await asyncio.to_thread(self._compute_frontier, request, progress)
+    
+    async def analyze_portfolios(
+        self,
+        request: PortfolioAnalyticsRequest,
+        progress: Optional[ProgressCallback] = None
+    ) -> PortfolioAnalyticsResponse:
+        """Risk metrics for many portfolios over one covariance and scenario set"""
+        if progress is not None:
+            progress(0.0, "loading returns")
+        returns = await asyncio.to_thread(self._load_returns, request.symbols, request.lookback_period)
+        cov = self._estimate_covariance(returns, request.use_ledoit_wolf)
+        scenarios = self._scenarios(returns)
+        metrics = batch_risk_metrics(
+            np.asarray(request.portfolios, dtype=float).reshape(-1, len(request.symbols)),
+            cov.values,
+            CovarianceEstimator.estimate_mean(returns).values,
+            scenarios=scenarios,
+            alpha=request.alpha,
+            progress=_stage(progress, 0.1, 0.95)
+        )
+        
+        portfolios = []
+        for i in range(len(request.portfolios)):
+            portfolios.append(PortfolioRiskMetrics(
+                expected_return=float(metrics.expected_return[i]),
+                volatility=float(metrics.volatility[i]),
+                sharpe_ratio=self._finite(metrics.sharpe_ratio[i]),
+                var=self._finite(metrics.var[i]),
+                cvar=self._finite(metrics.cvar[i]),
+                diversification_ratio=self._finite(metrics.diversification_ratio[i]),
+                hhi=self._finite(metrics.hhi[i]),
+                marginal_risk=metrics.marginal_risk[i].tolist() if request.include_contributions else None,
+                risk_contributions=metrics.risk_contributions[i].tolist() if request.include_contributions else None
+            ))
+        return PortfolioAnalyticsResponse(
+            symbols=request.symbols,
+            num_scenarios=len(scenarios),
+            portfolios=portfolios
         )
     
     async def stress_test(self, request: OptimizationRequest):
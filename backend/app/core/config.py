@@ -2,7 +2,7 @@
 Application Configuration
 """
 from pydantic_settings import BaseSettings
-from typing import List, Union
+from typing import List, Optional, Union
 from pydantic import field_validator
 
 
@@ -26,18 +26,53 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./portfolio_optimizer.db"
+    DATABASE_READ_URL: Optional[str] = None  # Read replica; defaults to DATABASE_URL
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: int = 30
+    DATABASE_POOL_RECYCLE: int = 1800
+    
+    # SQLite tuning (ignored for server databases)
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MB
+    SQLITE_CACHE_SIZE_KB: int = 65536  # 64 MB page cache per connection
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
     
     # Redis (optional)
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Job queue ("redis" for shared workers, "local" for in-process threads)
+    JOB_QUEUE_BACKEND: str = "redis"
+    JOB_QUEUE_NAME: str = "opcvm:jobs"
+    JOB_RESULT_TTL_SECONDS: int = 3600
+    JOB_PENDING_TTL_SECONDS: int = 86400
+    JOB_LOCAL_WORKERS: int = 2
+    JOB_HEARTBEAT_SECONDS: int = 15  # Running jobs refresh their state this often
+    JOB_VISIBILITY_TIMEOUT_SECONDS: int = 120  # Running jobs silent for longer are requeued
+    JOB_MAX_ATTEMPTS: int = 3  # Jobs lost by this many workers are failed instead
+    
     # Data Sources
     CASABLANCA_BOURSE_BASE_URL: str = "https://www.casablanca-bourse.com"
     ASFIM_BASE_URL: str = "https://www.asfim.ma"
+    STOCK_HISTORY_PATH: str = "/history/{symbol}.csv"  # CSV export, {symbol} is substituted
+    
+    # Scrapers
+    SCRAPER_MAX_CONCURRENCY: int = 8
+    SCRAPER_RATE_LIMIT_PER_HOST: float = 2.0  # Requests per second per host
+    SCRAPER_TIMEOUT: float = 30.0
+    SCRAPER_MAX_RETRIES: int = 2
+    SCRAPER_CACHE_DIR: str = "./data/http_cache"
     
     # Optimization Parameters
     DEFAULT_ALPHA: float = 0.05
     DEFAULT_REGULARIZATION_LAMBDA: float = 0.01
     MAX_PORTFOLIO_SIZE: int = 100
+    FRONTIER_RESAMPLING_WORKERS: int = 0  # Processes for resampled frontiers (0 = CPU count)
+    
+    # Volatility models (nightly GARCH refit)
+    VOLATILITY_LOOKBACK_DAYS: int = 750  # Trading days of returns per fit
+    VOLATILITY_MIN_OBSERVATIONS: int = 100  # Symbols with fewer returns are skipped
+    VOLATILITY_WORKERS: int = 0  # Processes for GARCH fits (0 = CPU count)
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,122 @@
+"""
+Engine factories for the database layer
+
+SQLite file databases run in WAL mode so API readers never wait on the
+importer's write transaction. Server databases get a sized connection pool.
+"""
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool, StaticPool
+from app.core.config import settings
+
+
+def is_sqlite(url: str) -> bool:
+    """Check whether a database URL points to SQLite"""
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def is_memory_sqlite(url: str) -> bool:
+    """Check whether a database URL is an in-memory SQLite database"""
+    if not is_sqlite(url):
+        return False
+    database = make_url(url).database
+    return not database or database == ":memory:"
+
+
+def _pool_kwargs() -> dict:
+    return {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+def _install_sqlite_pragmas(engine: Engine, read_only: bool, memory: bool):
+    """Apply per-connection pragmas every time the pool opens a connection"""
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            # journal_mode is persistent in the file, only the writer sets it
+            if not read_only and not memory:
+                cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+            cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+            cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+            cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA foreign_keys=ON")
+            if read_only:
+                cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
+
+def build_engine(url: str, read_only: bool = False) -> Engine:
+    """
+    Create a synchronous engine
+
+    Args:
+        url: Database URL
+        read_only: Reject writes on every pooled connection (SQLite only;
+            server databases should point DATABASE_READ_URL at a replica)
+
+    Returns:
+        Configured SQLAlchemy engine
+    """
+    if not is_sqlite(url):
+        return create_engine(url, **_pool_kwargs())
+
+    memory = is_memory_sqlite(url)
+    if memory:
+        # A single shared connection, otherwise each checkout sees an empty database
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    else:
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            poolclass=QueuePool,
+            **_pool_kwargs(),
+        )
+    _install_sqlite_pragmas(engine, read_only=read_only, memory=memory)
+    return engine
+
+
+def to_async_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    drivers = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "mysql": "aiomysql"}
+    if backend not in drivers:
+        raise ValueError(f"No async driver known for database backend '{backend}'")
+    return parsed.set(drivername=f"{backend}+{drivers[backend]}").render_as_string(hide_password=False)
+
+
+def build_async_engine(url: str, read_only: bool = False):
+    """
+    Create an asyncio engine for the same database
+
+    Requires the matching async driver (aiosqlite for SQLite).
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    async_url = to_async_url(url)
+    if not is_sqlite(url):
+        return create_async_engine(async_url, **_pool_kwargs())
+
+    memory = is_memory_sqlite(url)
+    if memory:
+        engine = create_async_engine(async_url, poolclass=StaticPool)
+    else:
+        engine = create_async_engine(async_url, poolclass=AsyncAdaptedQueuePool, **_pool_kwargs())
+    _install_sqlite_pragmas(engine.sync_engine, read_only=read_only, memory=memory)
+    return engine
+
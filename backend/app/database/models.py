@@ -1,11 +1,12 @@
 """
 Database models for caching market data
 """
-from sqlalchemy import create_engine, Column, String, Float, Integer, DateTime, Text, Index
+from sqlalchemy import Column, String, Float, Integer, DateTime, Text, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
 from app.core.config import settings
+from app.database.engine import build_engine, build_async_engine, is_memory_sqlite
 
 Base = declarative_base()
 
@@ -30,6 +31,25 @@ class StockPrice(Base):
     )
 
 
+class CorporateAction(Base):
+    """Dividends and splits used to compute adjusted_close"""
+    __tablename__ = "corporate_actions"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    symbol = Column(String(20), nullable=False, index=True)
+    ex_date = Column(DateTime, nullable=False)
+    action_type = Column(String(20), nullable=False)  # "dividend" or "split"
+    amount = Column(Float, nullable=True)  # Cash dividend per share (MAD)
+    ratio = Column(Float, nullable=True)  # Split: new shares per old share (2.0 for 2-for-1)
+    applied_at = Column(DateTime, nullable=True)  # Null until prices are re-adjusted
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_action_symbol_date', 'symbol', 'ex_date'),
+        UniqueConstraint('symbol', 'ex_date', 'action_type', name='uq_action'),
+    )
+
+
 class StockInfo(Base):
     """Stock information (metadata)"""
     __tablename__ = "stock_info"
@@ -80,10 +100,59 @@ class MarketIndex(Base):
     )
 
 
+class VolatilityModel(Base):
+    """Latest GARCH(1,1) fit per symbol, reused as the next fit's starting point"""
+    __tablename__ = "volatility_models"
+    
+    symbol = Column(String(20), primary_key=True)
+    omega = Column(Float, nullable=False)
+    alpha = Column(Float, nullable=False)
+    beta = Column(Float, nullable=False)
+    mean_return = Column(Float, nullable=False)
+    long_run_variance = Column(Float, nullable=False)
+    last_variance = Column(Float, nullable=False)  # Conditional variance on as_of
+    last_innovation = Column(Float, nullable=False)  # Squared demeaned return on as_of
+    forecast_volatility = Column(Float, nullable=False)  # Daily volatility for the next session
+    log_likelihood = Column(Float, nullable=True)
+    observations = Column(Integer, nullable=False)
+    as_of = Column(DateTime, nullable=False)  # Last return date used
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class DataVersion(Base):
+    """Monotonic version per dataset, bumped by every writer (used for HTTP ETags)"""
+    __tablename__ = "data_versions"
+    
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+def bump_data_version(db, name: str):
+    """Increment a dataset version within the caller's transaction"""
+    row = db.get(DataVersion, name)
+    if row is None:
+        db.add(DataVersion(name=name, version=1))
+    else:
+        row.version += 1
+
+
 # Database setup
-engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False})
+# Writer pool: used by init_db and the import scripts
+engine = build_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Reader pool: used by API routes, never contends with the importer under WAL
+_read_url = settings.DATABASE_READ_URL or settings.DATABASE_URL
+if is_memory_sqlite(_read_url):
+    # An in-memory database only exists inside the writer's single connection
+    read_engine = engine
+else:
+    read_engine = build_engine(_read_url, read_only=True)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+_async_session_factory = None
+
 
 def init_db():
     """Initialize database tables"""
@@ -98,3 +167,27 @@ def get_db():
     finally:
         db.close()
 
+
+def get_read_db():
+    """Get read-only database session"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_async_session_factory():
+    """Lazily build the read-only async session factory"""
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        async_engine = build_async_engine(_read_url, read_only=True)
+        _async_session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    return _async_session_factory
+
+
+async def get_async_db():
+    """Get read-only async database session for FastAPI routes"""
+    async with get_async_session_factory()() as db:
+        yield db
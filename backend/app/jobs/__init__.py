@@ -0,0 +1,28 @@
+# Job queue module
+from app.core.config import settings
+from app.jobs.queue import JobQueue, JobRecord, JobStatus, LocalJobQueue, RedisJobQueue
+
+_queue = None
+
+
+def get_job_queue() -> JobQueue:
+    """Configured job queue (local backend also starts in-process workers)"""
+    global _queue
+    if _queue is None:
+        if settings.JOB_QUEUE_BACKEND == "local":
+            from app.jobs.worker import start_local_workers
+            _queue = LocalJobQueue()
+            start_local_workers(_queue, settings.JOB_LOCAL_WORKERS)
+        else:
+            _queue = RedisJobQueue()
+    return _queue
+
+
+__all__ = [
+    "JobQueue",
+    "JobRecord",
+    "JobStatus",
+    "LocalJobQueue",
+    "RedisJobQueue",
+    "get_job_queue",
+]
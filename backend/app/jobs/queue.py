@@ -0,0 +1,359 @@
+"""
+Job queue backends
+
+Jobs are identified by a hash of their type and payload, so submitting an
+identical request while it is queued, running or its result is still
+cached returns the existing job instead of computing it again.
+"""
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+
+class JobStatus(str, Enum):
+    """Job lifecycle states"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class JobRecord:
+    """Stored state of a job"""
+    job_id: str
+    job_type: str
+    payload: Dict[str, Any]
+    status: JobStatus = JobStatus.QUEUED
+    progress: float = 0.0
+    message: Optional[str] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    def to_mapping(self) -> Dict[str, str]:
+        """Flat string mapping (Redis hash fields)"""
+        data = asdict(self)
+        data['status'] = self.status.value
+        return {
+            key: json.dumps(value)
+            for key, value in data.items()
+        }
+
+    @classmethod
+    def from_mapping(cls, mapping: Dict[str, str]) -> "JobRecord":
+        data = {key: json.loads(value) for key, value in mapping.items()}
+        data['status'] = JobStatus(data['status'])
+        return cls(**data)
+
+
+def job_id_for(job_type: str, payload: Dict[str, Any]) -> str:
+    """Deterministic job id: identical requests map to the same job"""
+    canonical = json.dumps({"type": job_type, "payload": payload}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+class JobQueue(ABC):
+    """Queue interface shared by the API (submit/get) and workers (claim/report)"""
+
+    @abstractmethod
+    def submit(self, job_type: str, payload: Dict[str, Any]) -> JobRecord:
+        """Enqueue a job, or return the existing one if identical work is pending or cached"""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        """Current state of a job (None once expired)"""
+
+    @abstractmethod
+    def claim(self, timeout: float = 1.0) -> Optional[JobRecord]:
+        """Take the next queued job and mark it running, waiting up to `timeout` seconds"""
+
+    @abstractmethod
+    def update_progress(self, job_id: str, progress: float, message: Optional[str] = None):
+        """Report progress of a running job (0 to 1)"""
+
+    @abstractmethod
+    def heartbeat(self, job_id: str):
+        """Signal that the worker running a job is still alive"""
+
+    def requeue_stale(self) -> int:
+        """
+        Requeue (or fail, after too many attempts) running jobs whose worker
+        stopped heartbeating
+
+        Returns:
+            Number of jobs recovered
+        """
+        return 0
+
+    @abstractmethod
+    def complete(self, job_id: str, result: Any):
+        """Store the result; it expires after the result TTL"""
+
+    @abstractmethod
+    def fail(self, job_id: str, error: str):
+        """Mark a job failed; resubmitting it queues it again"""
+
+
+class LocalJobQueue(JobQueue):
+    """In-process queue for development and tests"""
+
+    def __init__(self, result_ttl: Optional[int] = None):
+        self.result_ttl = settings.JOB_RESULT_TTL_SECONDS if result_ttl is None else result_ttl
+        self._jobs: Dict[str, JobRecord] = {}
+        self._expires_at: Dict[str, float] = {}
+        self._pending = deque()
+        self._condition = threading.Condition()
+
+    def _live(self, job_id: str) -> Optional[JobRecord]:
+        expires_at = self._expires_at.get(job_id)
+        if expires_at is not None and expires_at <= time.time():
+            self._jobs.pop(job_id, None)
+            self._expires_at.pop(job_id, None)
+        return self._jobs.get(job_id)
+
+    def submit(self, job_type: str, payload: Dict[str, Any]) -> JobRecord:
+        job_id = job_id_for(job_type, payload)
+        with self._condition:
+            existing = self._live(job_id)
+            if existing is not None and existing.status != JobStatus.FAILED:
+                return existing
+            job = JobRecord(job_id=job_id, job_type=job_type, payload=payload)
+            self._jobs[job_id] = job
+            self._expires_at.pop(job_id, None)
+            self._pending.append(job_id)
+            self._condition.notify()
+            return job
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        with self._condition:
+            return self._live(job_id)
+
+    def claim(self, timeout: float = 1.0) -> Optional[JobRecord]:
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while not self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+            job = self._jobs[self._pending.popleft()]
+            job.status = JobStatus.RUNNING
+            job.attempts += 1
+            job.updated_at = time.time()
+            return job
+
+    def update_progress(self, job_id: str, progress: float, message: Optional[str] = None):
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.progress = progress
+                job.message = message
+                job.updated_at = time.time()
+
+    def heartbeat(self, job_id: str):
+        # Workers are threads of this process: a job cannot outlive its worker
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.updated_at = time.time()
+
+    def complete(self, job_id: str, result: Any):
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.status = JobStatus.COMPLETED
+                job.progress = 1.0
+                job.result = result
+                job.updated_at = time.time()
+                self._expires_at[job_id] = job.updated_at + self.result_ttl
+
+    def fail(self, job_id: str, error: str):
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.status = JobStatus.FAILED
+                job.error = error
+                job.updated_at = time.time()
+                self._expires_at[job_id] = job.updated_at + self.result_ttl
+
+
+# Atomically create the job unless an identical one is queued, running or
+# completed; failed jobs, and running jobs whose worker stopped
+# heartbeating, are replaced and queued again.
+_SUBMIT_SCRIPT = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if status == '"running"' then
+    local updated_at = tonumber(redis.call('HGET', KEYS[1], 'updated_at'))
+    if updated_at and updated_at >= tonumber(ARGV[3]) - tonumber(ARGV[4]) then
+        return 0
+    end
+    redis.call('LREM', KEYS[3], 0, ARGV[1])
+elseif status and status ~= '"failed"' then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], unpack(ARGV, 5))
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('LPUSH', KEYS[2], ARGV[1])
+return 1
+"""
+
+# Recover one claimed job whose worker stopped heartbeating: queue it again
+# at the head of the queue, or fail it once it used all its attempts.
+# Jobs still marked queued are skipped: claim sets them running right after
+# moving them to the processing list.
+_REQUEUE_SCRIPT = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if not status then
+    redis.call('LREM', KEYS[2], 0, ARGV[1])
+    return 0
+end
+if status ~= '"running"' then
+    return 0
+end
+local updated_at = tonumber(redis.call('HGET', KEYS[1], 'updated_at'))
+if updated_at and updated_at >= tonumber(ARGV[2]) - tonumber(ARGV[3]) then
+    return 0
+end
+if redis.call('LREM', KEYS[2], 0, ARGV[1]) == 0 then
+    return 0
+end
+local attempts = tonumber(redis.call('HGET', KEYS[1], 'attempts') or '0')
+if attempts >= tonumber(ARGV[4]) then
+    redis.call('HSET', KEYS[1], 'status', '"failed"', 'error', ARGV[5], 'updated_at', ARGV[2])
+    redis.call('EXPIRE', KEYS[1], ARGV[6])
+    return 2
+end
+redis.call('HSET', KEYS[1], 'status', '"queued"', 'updated_at', ARGV[2])
+redis.call('RPUSH', KEYS[3], ARGV[1])
+return 1
+"""
+
+
+class RedisJobQueue(JobQueue):
+    """
+    Redis-backed queue shared by API nodes and workers on any host
+
+    Layout:
+        {name}             list of queued job ids
+        {name}:processing  ids claimed by a worker
+        {name}:job:{id}    hash with the job state (JSON encoded fields)
+
+    Workers refresh `updated_at` while a job runs; a running job not
+    refreshed within the visibility timeout belongs to a dead worker and is
+    requeued by `requeue_stale` (or by an identical submission).
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        name: Optional[str] = None,
+        result_ttl: Optional[int] = None,
+        pending_ttl: Optional[int] = None,
+        visibility_timeout: Optional[int] = None,
+        max_attempts: Optional[int] = None
+    ):
+        if redis_client is None:
+            import redis
+            redis_client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        self.redis = redis_client
+        self.name = name or settings.JOB_QUEUE_NAME
+        self.result_ttl = settings.JOB_RESULT_TTL_SECONDS if result_ttl is None else result_ttl
+        self.pending_ttl = settings.JOB_PENDING_TTL_SECONDS if pending_ttl is None else pending_ttl
+        self.visibility_timeout = (
+            settings.JOB_VISIBILITY_TIMEOUT_SECONDS if visibility_timeout is None else visibility_timeout
+        )
+        self.max_attempts = settings.JOB_MAX_ATTEMPTS if max_attempts is None else max_attempts
+        self._submit = self.redis.register_script(_SUBMIT_SCRIPT)
+        self._requeue = self.redis.register_script(_REQUEUE_SCRIPT)
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.name}:job:{job_id}"
+
+    @property
+    def _processing_key(self) -> str:
+        return f"{self.name}:processing"
+
+    def submit(self, job_type: str, payload: Dict[str, Any]) -> JobRecord:
+        job = JobRecord(job_id=job_id_for(job_type, payload), job_type=job_type, payload=payload)
+        fields = [item for pair in job.to_mapping().items() for item in pair]
+        created = self._submit(
+            keys=[self._job_key(job.job_id), self.name, self._processing_key],
+            args=[job.job_id, self.pending_ttl, time.time(), self.visibility_timeout] + fields
+        )
+        if created:
+            return job
+        return self.get(job.job_id) or job
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        mapping = self.redis.hgetall(self._job_key(job_id))
+        return JobRecord.from_mapping(mapping) if mapping else None
+
+    def claim(self, timeout: float = 1.0) -> Optional[JobRecord]:
+        job_id = self.redis.blmove(self.name, self._processing_key, timeout, "RIGHT", "LEFT")
+        if job_id is None:
+            return None
+        key = self._job_key(job_id)
+        if not self.redis.exists(key):
+            self.redis.lrem(self._processing_key, 1, job_id)
+            return None
+        pipe = self.redis.pipeline()
+        pipe.hset(key, mapping={
+            "status": json.dumps(JobStatus.RUNNING.value),
+            "updated_at": json.dumps(time.time())
+        })
+        pipe.hincrby(key, "attempts", 1)
+        pipe.execute()
+        return self.get(job_id)
+
+    def update_progress(self, job_id: str, progress: float, message: Optional[str] = None):
+        self.redis.hset(self._job_key(job_id), mapping={
+            "progress": json.dumps(progress),
+            "message": json.dumps(message),
+            "updated_at": json.dumps(time.time())
+        })
+
+    def heartbeat(self, job_id: str):
+        self.redis.hset(self._job_key(job_id), "updated_at", json.dumps(time.time()))
+
+    def requeue_stale(self) -> int:
+        recovered = 0
+        for job_id in self.redis.lrange(self._processing_key, 0, -1):
+            recovered += bool(self._requeue(
+                keys=[self._job_key(job_id), self._processing_key, self.name],
+                args=[
+                    job_id,
+                    time.time(),
+                    self.visibility_timeout,
+                    self.max_attempts,
+                    json.dumps(f"Worker lost {self.max_attempts} times while running this job"),
+                    self.result_ttl
+                ]
+            ))
+        return recovered
+
+    def _finish(self, job_id: str, fields: Dict[str, Any]):
+        key = self._job_key(job_id)
+        fields["updated_at"] = time.time()
+        pipe = self.redis.pipeline()
+        pipe.hset(key, mapping={name: json.dumps(value) for name, value in fields.items()})
+        pipe.expire(key, self.result_ttl)
+        pipe.lrem(self._processing_key, 1, job_id)
+        pipe.execute()
+
+    def complete(self, job_id: str, result: Any):
+        self._finish(job_id, {"status": JobStatus.COMPLETED.value, "progress": 1.0, "result": result})
+
+    def fail(self, job_id: str, error: str):
+        self._finish(job_id, {"status": JobStatus.FAILED.value, "error": error})
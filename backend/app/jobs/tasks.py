@@ -0,0 +1,70 @@
+"""
+Job handlers
+
+Each job type maps to its request model and the OptimizationService
+coroutine that computes it, so a job runs exactly what the matching
+synchronous endpoint would.
+"""
+import asyncio
+import inspect
+from typing import Any, Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from app.api.models.optimization import (
+    OptimizationRequest,
+    EfficientFrontierRequest,
+    PortfolioAnalyticsRequest
+)
+from app.api.services.optimization_service import OptimizationService, ProgressCallback
+
+
+# job type -> (request model, OptimizationService method)
+JOB_TYPES: Dict[str, Tuple[Type[BaseModel], str]] = {
+    "mean_variance": (OptimizationRequest, "optimize_mean_variance"),
+    "cvar": (OptimizationRequest, "optimize_cvar"),
+    "robust": (OptimizationRequest, "optimize_robust"),
+    "hrp": (OptimizationRequest, "optimize_hrp"),
+    "risk_parity": (OptimizationRequest, "optimize_risk_parity"),
+    "efficient_frontier": (EfficientFrontierRequest, "calculate_efficient_frontier"),
+    "stress_test": (OptimizationRequest, "stress_test"),
+    "portfolio_analytics": (PortfolioAnalyticsRequest, "analyze_portfolios"),
+}
+
+_service: Optional[OptimizationService] = None
+
+
+def _get_service() -> OptimizationService:
+    # One service per worker process keeps optimizer caches warm between jobs
+    global _service
+    if _service is None:
+        _service = OptimizationService()
+    return _service
+
+
+def normalize_payload(job_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate a payload against its request model and fill in defaults
+
+    Raises:
+        KeyError: unknown job type
+        pydantic.ValidationError: invalid payload
+    """
+    model, _ = JOB_TYPES[job_type]
+    return model(**payload).model_dump(mode="json")
+
+
+def run_job(job_type: str, payload: Dict[str, Any], progress: ProgressCallback) -> Any:
+    """Run a job and return a JSON-serializable result"""
+    model, method_name = JOB_TYPES[job_type]
+    request = model(**payload)
+    progress(0.0, "started")
+    method = getattr(_get_service(), method_name)
+    if "progress" in inspect.signature(method).parameters:
+        # Long-running paths report their own progress (e.g. per sample chunk)
+        result = asyncio.run(method(request, progress=progress))
+    else:
+        result = asyncio.run(method(request))
+    if isinstance(result, BaseModel):
+        return result.model_dump(mode="json")
+    return result
@@ -0,0 +1,120 @@
+"""
+Job worker
+
+Run one or more worker processes on any host that can reach Redis:
+
+    python -m app.jobs.worker --processes 4
+"""
+import argparse
+import logging
+import multiprocessing
+import threading
+import time
+from typing import Callable, Optional
+
+from app.core.config import settings
+from app.jobs.queue import JobQueue, JobRecord
+from app.jobs.tasks import run_job
+
+logger = logging.getLogger(__name__)
+
+
+def process_job(
+    queue: JobQueue,
+    job: JobRecord,
+    handler: Callable = run_job,
+    heartbeat_interval: Optional[float] = None
+):
+    """Run a claimed job and record its result or error"""
+    def report(progress: float, message: Optional[str] = None):
+        queue.update_progress(job.job_id, progress, message)
+
+    # Keep the job visible as alive while the handler runs, even between
+    # progress reports
+    interval = settings.JOB_HEARTBEAT_SECONDS if heartbeat_interval is None else heartbeat_interval
+    done = threading.Event()
+
+    def beat():
+        while not done.wait(interval):
+            try:
+                queue.heartbeat(job.job_id)
+            except Exception:
+                logger.exception(f"Heartbeat for job {job.job_id} failed")
+
+    threading.Thread(target=beat, name=f"heartbeat-{job.job_id[:8]}", daemon=True).start()
+    try:
+        result = handler(job.job_type, job.payload, report)
+    except Exception as e:
+        logger.exception(f"Job {job.job_id} ({job.job_type}) failed")
+        queue.fail(job.job_id, str(e))
+        return
+    finally:
+        done.set()
+    queue.complete(job.job_id, result)
+
+
+def run_worker(
+    queue: JobQueue,
+    stop_event: Optional[threading.Event] = None,
+    poll_timeout: float = 1.0,
+    handler: Callable = run_job
+):
+    """Claim and process jobs until `stop_event` is set"""
+    next_sweep = 0.0
+    while stop_event is None or not stop_event.is_set():
+        # Any worker recovers jobs left running by workers that died
+        if time.monotonic() >= next_sweep:
+            try:
+                recovered = queue.requeue_stale()
+                if recovered:
+                    logger.warning(f"Recovered {recovered} job(s) from dead workers")
+            except Exception:
+                logger.exception("Stale job sweep failed")
+            next_sweep = time.monotonic() + settings.JOB_HEARTBEAT_SECONDS
+        job = queue.claim(timeout=poll_timeout)
+        if job is not None:
+            process_job(queue, job, handler)
+
+
+def start_local_workers(queue: JobQueue, count: int) -> threading.Event:
+    """Start daemon worker threads in this process (local backend)"""
+    stop_event = threading.Event()
+    for i in range(count):
+        threading.Thread(
+            target=run_worker,
+            args=(queue, stop_event),
+            name=f"job-worker-{i}",
+            daemon=True
+        ).start()
+    return stop_event
+
+
+def _redis_worker_main():
+    from app.core.logging_config import setup_logging
+    from app.jobs.queue import RedisJobQueue
+    setup_logging()
+    run_worker(RedisJobQueue())
+
+
+def main():
+    """Start worker processes against the Redis queue"""
+    parser = argparse.ArgumentParser(description="Portfolio Optimizer Pro job worker")
+    parser.add_argument("--processes", type=int, default=multiprocessing.cpu_count())
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        _redis_worker_main()
+        return
+
+    processes = [
+        multiprocessing.Process(target=_redis_worker_main, name=f"job-worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
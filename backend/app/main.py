@@ -5,7 +5,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.logging_config import setup_logging
-from app.api.routes import optimization, health
+from app.api.routes import optimization, health, jobs, data
 from app.database.models import init_db
 
 # Setup logging
@@ -34,6 +34,8 @@ app.add_middleware(
 # Include routers
 app.include_router(health.router, prefix="/api", tags=["Health"])
 app.include_router(optimization.router, prefix="/api/v1", tags=["Optimization"])
+app.include_router(jobs.router, prefix="/api/v1", tags=["Jobs"])
+app.include_router(data.router, prefix="/api/v1", tags=["Data"])
 
 
 @app.get("/")
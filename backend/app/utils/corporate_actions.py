@@ -0,0 +1,164 @@
+"""
+Corporate action adjustments for adjusted_close
+
+Each event contributes a factor on the last trading day before its
+ex-date: 1 - dividend / previous close for cash dividends, 1 / ratio for
+splits. The adjustment of a given day is the product of the factors of
+all later events, i.e. a reverse cumulative product over the history,
+computed for every affected symbol in one grouped pass.
+"""
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, update
+
+from app.database.models import CorporateAction, StockPrice, bump_data_version
+
+DIVIDEND = "dividend"
+SPLIT = "split"
+
+
+def compute_adjusted_close(prices: pd.DataFrame, actions: pd.DataFrame) -> pd.Series:
+    """
+    Backward-adjusted close prices
+
+    Args:
+        prices: columns symbol, date, close (any order)
+        actions: columns symbol, ex_date, action_type, amount, ratio
+
+    Returns:
+        Adjusted close aligned on `prices.index`
+    """
+    ordered = prices[['symbol', 'date', 'close']].sort_values(['symbol', 'date'])
+    if actions.empty:
+        return prices['close'].astype(float).copy()
+
+    events = actions[['symbol', 'ex_date', 'action_type', 'amount', 'ratio']].sort_values('ex_date')
+    # Last trading day strictly before each ex-date, per symbol
+    anchors = pd.merge_asof(
+        events,
+        ordered.assign(anchor_index=ordered.index).sort_values('date'),
+        left_on='ex_date',
+        right_on='date',
+        by='symbol',
+        direction='backward',
+        allow_exact_matches=False
+    ).dropna(subset=['anchor_index'])
+
+    is_split = anchors['action_type'] == SPLIT
+    factor = np.where(
+        is_split,
+        1.0 / anchors['ratio'].astype(float),
+        1.0 - anchors['amount'].astype(float) / anchors['close'].astype(float)
+    )
+    anchors = anchors.assign(factor=factor)
+    anchors = anchors[np.isfinite(anchors['factor']) & (anchors['factor'] > 0)]
+
+    # Several events anchored on the same day compound
+    day_factor = anchors.groupby('anchor_index')['factor'].prod()
+    daily = pd.Series(1.0, index=ordered.index)
+    daily.loc[day_factor.index.astype(ordered.index.dtype)] = day_factor.values
+
+    # Reverse cumulative product within each symbol: a day is adjusted by
+    # every event anchored on or after it
+    reversed_daily = daily.iloc[::-1]
+    cumulative = reversed_daily.groupby(ordered['symbol'].iloc[::-1].values).cumprod().iloc[::-1]
+
+    adjusted = ordered['close'].astype(float) * cumulative
+    return adjusted.reindex(prices.index)
+
+
+def readjust_symbols(db, symbols: Iterable[str]) -> int:
+    """
+    Recompute adjusted_close for whole histories and write back the rows
+    whose value changed, in bulk
+
+    Marks the actions that were used as applied and bumps the stock_prices
+    version only if a row changed. The caller commits.
+
+    Returns:
+        Number of price rows updated
+    """
+    symbols = sorted(set(symbols))
+    if not symbols:
+        return 0
+
+    prices = pd.DataFrame(
+        db.query(StockPrice.id, StockPrice.symbol, StockPrice.date, StockPrice.close, StockPrice.adjusted_close)
+        .filter(StockPrice.symbol.in_(symbols)).all(),
+        columns=['id', 'symbol', 'date', 'close', 'adjusted_close']
+    )
+    actions = pd.DataFrame(
+        db.query(
+            CorporateAction.id,
+            CorporateAction.symbol,
+            CorporateAction.ex_date,
+            CorporateAction.action_type,
+            CorporateAction.amount,
+            CorporateAction.ratio
+        ).filter(CorporateAction.symbol.in_(symbols)).all(),
+        columns=['action_id', 'symbol', 'ex_date', 'action_type', 'amount', 'ratio']
+    )
+    if prices.empty:
+        return 0
+
+    # Events whose ex-date has not traded yet stay pending: their anchor day
+    # (the session before the ex-date) may not be loaded yet
+    last_date = prices.groupby('symbol')['date'].max()
+    actions = actions[actions['ex_date'] <= actions['symbol'].map(last_date)]
+
+    adjusted = compute_adjusted_close(prices, actions).to_numpy()
+    current = prices['adjusted_close'].to_numpy(dtype=float)
+    changed = np.isnan(current) | ~np.isclose(current, adjusted, rtol=1e-12, atol=0.0)
+    if changed.any():
+        # Bulk UPDATE by primary key, one executemany instead of one ORM object per row
+        db.execute(
+            update(StockPrice),
+            [
+                {'id': int(row_id), 'adjusted_close': float(value)}
+                for row_id, value in zip(prices['id'].values[changed], adjusted[changed])
+            ]
+        )
+        bump_data_version(db, 'stock_prices')
+    if not actions.empty:
+        db.query(CorporateAction).filter(
+            CorporateAction.id.in_([int(i) for i in actions['action_id']]),
+            CorporateAction.applied_at.is_(None)
+        ).update({CorporateAction.applied_at: datetime.utcnow()}, synchronize_session=False)
+    return int(changed.sum())
+
+
+def pending_symbols(db) -> List[str]:
+    """
+    Symbols with corporate actions not yet reflected in adjusted_close
+
+    Announced events whose ex-date has not traded yet are left out until
+    prices reach it, so they do not trigger a full re-adjustment every run.
+    """
+    last_dates = db.query(
+        StockPrice.symbol,
+        func.max(StockPrice.date).label('last_date')
+    ).group_by(StockPrice.symbol).subquery()
+    rows = db.query(CorporateAction.symbol).join(
+        last_dates, CorporateAction.symbol == last_dates.c.symbol
+    ).filter(
+        CorporateAction.applied_at.is_(None),
+        CorporateAction.ex_date <= last_dates.c.last_date
+    ).distinct().all()
+    return [row[0] for row in rows]
+
+
+def apply_pending_adjustments(db, extra_symbols: Optional[Iterable[str]] = None) -> int:
+    """
+    Re-adjust only symbols affected by newly loaded events (plus `extra_symbols`,
+    e.g. symbols whose older history was just imported). The caller commits.
+    """
+    symbols = set(pending_symbols(db))
+    if extra_symbols:
+        with_actions = db.query(CorporateAction.symbol).filter(
+            CorporateAction.symbol.in_(list(extra_symbols))
+        ).distinct().all()
+        symbols.update(row[0] for row in with_actions)
+    return readjust_symbols(db, symbols)
@@ -3,7 +3,145 @@ Covariance estimation utilities
 """
 import numpy as np
 import pandas as pd
-from sklearn.covariance import LedoitWolf
+from typing import Optional, Tuple
+from sklearn.covariance import LedoitWolf, ledoit_wolf_shrinkage
+
+
+def nearest_psd(cov: np.ndarray, eps: float = 1e-10) -> np.ndarray:
+    """
+    Repair a symmetric matrix to positive semi-definite by clipping negative
+    eigenvalues, then rescaling so the original variances are preserved
+    """
+    cov = 0.5 * (cov + cov.T)
+    eigvals, eigvecs = np.linalg.eigh(cov)
+    if eigvals[0] >= -eps * max(eigvals[-1], 1.0):
+        return cov
+    repaired = (eigvecs * np.clip(eigvals, eps, None)) @ eigvecs.T
+    scale = np.sqrt(np.diag(cov) / np.diag(repaired))
+    return repaired * np.outer(scale, scale)
+
+
+def pairwise_moments(
+    returns: np.ndarray,
+    mask: Optional[np.ndarray] = None,
+    min_periods: int = 2
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pairwise-complete means and covariances through masked matrix products
+
+    With X the returns zero-filled where unobserved and M the validity mask,
+    a single Gram matrix of [X, M] contains every sum the pairwise estimator
+    needs: XᵀX (cross products), XᵀM (sums of x_i where j is observed) and
+    MᵀM (pair counts).
+
+    Args:
+        returns: T x N array, NaN where unobserved
+        mask: T x N boolean validity mask (default: ~isnan(returns))
+        min_periods: Pairs with fewer common observations get zero covariance
+
+    Returns:
+        means (N,), covariance (N x N) with ddof=1, not yet repaired to PSD
+    """
+    if mask is None:
+        mask = ~np.isnan(returns)
+    m = mask.astype(np.float64)
+    x = np.where(mask, returns, 0.0)
+    n = x.shape[1]
+
+    stacked = np.hstack([x, m])
+    gram = stacked.T @ stacked
+    xx = gram[:n, :n]
+    xm = gram[:n, n:]  # xm[i, j] = sum of x_i over rows where j is observed
+    counts = gram[n:, n:]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = (xx - xm * xm.T / counts) / (counts - 1.0)
+        means = x.sum(axis=0) / m.sum(axis=0)
+
+    cov[counts < max(min_periods, 2)] = 0.0
+    return means, cov
+
+
+DEFAULT_EWMA_LAMBDA = 0.94  # RiskMetrics daily decay
+
+
+def _ewma_sums(
+    returns: np.ndarray,
+    lam: float,
+    mask: Optional[np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Decay-weighted cross products and pair weights (oldest row first)"""
+    if mask is None:
+        mask = ~np.isnan(returns)
+    m = mask.astype(np.float64)
+    x = np.where(mask, returns, 0.0)
+    weights = lam ** np.arange(len(x) - 1, -1, -1, dtype=np.float64)
+    return (x * weights[:, None]).T @ x, (m * weights[:, None]).T @ m
+
+
+def ewma_covariance(
+    returns: np.ndarray,
+    lam: float = DEFAULT_EWMA_LAMBDA,
+    mask: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Exponentially weighted covariance (zero mean, RiskMetrics style)
+
+    Same masked Gram trick as `pairwise_moments`: each pair is normalized by
+    the weights of the days both assets traded, so one product replaces the
+    day-by-day recursion.
+
+    Args:
+        returns: T x N array, oldest first, NaN where unobserved
+        lam: Decay factor
+        mask: T x N boolean validity mask (default: ~isnan(returns))
+
+    Returns:
+        N x N covariance
+    """
+    cross, pair_weight = _ewma_sums(returns, lam, mask)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.nan_to_num(cross / pair_weight)
+
+
+class EWMACovariance:
+    """
+    EWMA covariance updated one day at a time
+
+    Keeps the decayed cross products and pair weights, so a new day is a
+    rank-one update and the result always equals `ewma_covariance` on the
+    full history.
+    """
+
+    def __init__(self, n_assets: int, lam: float = DEFAULT_EWMA_LAMBDA):
+        self.lam = lam
+        self.cross = np.zeros((n_assets, n_assets))
+        self.pair_weight = np.zeros((n_assets, n_assets))
+
+    @classmethod
+    def from_returns(
+        cls,
+        returns: np.ndarray,
+        lam: float = DEFAULT_EWMA_LAMBDA,
+        mask: Optional[np.ndarray] = None
+    ) -> "EWMACovariance":
+        """Initialize from a history of returns (oldest first)"""
+        state = cls(returns.shape[1], lam)
+        state.cross, state.pair_weight = _ewma_sums(returns, lam, mask)
+        return state
+
+    def update(self, daily_returns: np.ndarray, mask: Optional[np.ndarray] = None):
+        """Add one day of returns; NaN or masked entries leave their pairs unchanged"""
+        observed = ~np.isnan(daily_returns) if mask is None else mask.astype(bool)
+        x = np.where(observed, daily_returns, 0.0)
+        m = observed.astype(np.float64)
+        self.cross = self.lam * self.cross + np.outer(x, x)
+        self.pair_weight = self.lam * self.pair_weight + np.outer(m, m)
+
+    @property
+    def covariance(self) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.nan_to_num(self.cross / self.pair_weight)
 
 
 class CovarianceEstimator:
@@ -20,14 +158,71 @@ class CovarianceEstimator:
         Returns:
             Estimated covariance matrix
         """
-        lw = LedoitWolf()
-        cov_matrix = lw.fit(returns.values).covariance_
+        if not returns.isna().values.any():
+            lw = LedoitWolf()
+            cov_matrix = lw.fit(returns.values).covariance_
+            return pd.DataFrame(cov_matrix, index=returns.columns, columns=returns.columns)
+        
+        # Missing data: shrink the pairwise-complete covariance towards μI with
+        # the intensity estimated on the demeaned, zero-filled returns
+        sample = CovarianceEstimator.estimate_sample(returns).values
+        centered = (returns - returns.mean()).fillna(0.0).values
+        shrinkage = ledoit_wolf_shrinkage(centered, assume_centered=True)
+        mu = np.trace(sample) / len(sample)
+        cov_matrix = (1.0 - shrinkage) * sample + shrinkage * mu * np.eye(len(sample))
         return pd.DataFrame(cov_matrix, index=returns.columns, columns=returns.columns)
     
     @staticmethod
-    def estimate_sample(returns: pd.DataFrame) -> pd.DataFrame:
-        """Estimate sample covariance"""
-        return returns.cov()
+    def estimate_sample(returns: pd.DataFrame, mask: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Estimate sample covariance from pairwise-complete observations
+        
+        Identical to `returns.cov()` on complete data; with gaps it costs one
+        matrix product instead of a per-pair NaN scan, and the result is
+        repaired to positive semi-definite.
+        
+        Args:
+            returns: DataFrame with returns, NaN where unobserved
+            mask: Optional validity mask (default: non-NaN entries)
+        """
+        _, cov = pairwise_moments(
+            returns.to_numpy(dtype=float),
+            None if mask is None else mask.to_numpy(dtype=bool)
+        )
+        return pd.DataFrame(nearest_psd(cov), index=returns.columns, columns=returns.columns)
+    
+    @staticmethod
+    def estimate_mean(returns: pd.DataFrame, mask: Optional[pd.DataFrame] = None) -> pd.Series:
+        """Estimate mean returns over each asset's observed dates"""
+        means, _ = pairwise_moments(
+            returns.to_numpy(dtype=float),
+            None if mask is None else mask.to_numpy(dtype=bool)
+        )
+        return pd.Series(means, index=returns.columns)
+    
+    @staticmethod
+    def estimate_ewma(
+        returns: pd.DataFrame,
+        lam: float = DEFAULT_EWMA_LAMBDA,
+        mask: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        Estimate exponentially weighted covariance
+        
+        Args:
+            returns: DataFrame with returns (oldest first), NaN where unobserved
+            lam: Decay factor (0.94 is the RiskMetrics daily value)
+            mask: Optional validity mask (default: non-NaN entries)
+        
+        Returns:
+            Estimated covariance matrix, repaired to positive semi-definite
+        """
+        cov = ewma_covariance(
+            returns.to_numpy(dtype=float),
+            lam,
+            None if mask is None else mask.to_numpy(dtype=bool)
+        )
+        return pd.DataFrame(nearest_psd(cov), index=returns.columns, columns=returns.columns)
     
     @staticmethod
     def estimate_regularized(returns: pd.DataFrame, lambda_reg: float = 0.01) -> pd.DataFrame:
@@ -41,7 +236,7 @@ class CovarianceEstimator:
         Returns:
             Regularized covariance matrix
         """
-        cov_sample = returns.cov()
+        cov_sample = CovarianceEstimator.estimate_sample(returns)
         n = len(cov_sample)
         cov_reg = cov_sample + lambda_reg * np.eye(n)
         return cov_reg
@@ -0,0 +1,237 @@
+"""
+Efficient frontier engines
+
+`FrontierSolver` compiles the long-only minimum-variance problem once per
+(universe size, bounds) with expected returns, a covariance factor and the
+target return as CVXPY parameters; tracing a frontier or solving hundreds
+of bootstrap frontiers only updates parameter values.
+
+`resampled_frontier` implements Michaud resampling: bootstrap the returns,
+trace a frontier per sample, and average weights point by point (the k-th
+point of every sample frontier has the same return rank).
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cvxpy as cp
+import numpy as np
+
+from app.utils.covariance_estimator import pairwise_moments, nearest_psd
+
+ProgressCallback = Callable[[float, Optional[str]], None]
+
+_solver_cache: Dict[Tuple[int, float, float], "FrontierSolver"] = {}
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+CHUNKS_PER_WORKER = 4
+
+
+def covariance_factor(cov: np.ndarray) -> np.ndarray:
+    """Matrix L with L Lᵀ = Σ (eigen square root, safe for singular Σ)"""
+    eigvals, eigvecs = np.linalg.eigh(0.5 * (cov + cov.T))
+    return eigvecs * np.sqrt(np.clip(eigvals, 0.0, None))
+
+
+def max_return_weights(mu: np.ndarray, min_weight: float, max_weight: float) -> np.ndarray:
+    """Highest-return portfolio under box and budget constraints (greedy fill)"""
+    n = len(mu)
+    weights = np.full(n, min_weight)
+    budget = 1.0 - weights.sum()
+    for i in np.argsort(-mu):
+        add = min(max_weight - min_weight, budget)
+        weights[i] += add
+        budget -= add
+        if budget <= 0:
+            break
+    return weights
+
+
+class FrontierSolver:
+    """Parameterized long-only frontier problems, compiled once"""
+
+    def __init__(self, n_assets: int, min_weight: float = 0.0, max_weight: float = 1.0):
+        if max_weight * n_assets < 1.0 - 1e-9 or min_weight * n_assets > 1.0 + 1e-9:
+            raise ValueError(
+                f"Weight bounds [{min_weight}, {max_weight}] are infeasible for {n_assets} assets"
+            )
+        self.n_assets = n_assets
+        self._lock = threading.Lock()  # Parameters are shared state
+        self.min_weight = min_weight
+        self.max_weight = max_weight
+
+        self.weights = cp.Variable(n_assets)
+        self.mu = cp.Parameter(n_assets)
+        self.factor = cp.Parameter((n_assets, n_assets))
+        self.target = cp.Parameter()
+
+        risk = cp.sum_squares(self.factor.T @ self.weights)
+        constraints = [
+            cp.sum(self.weights) == 1,
+            self.weights >= min_weight,
+            self.weights <= max_weight
+        ]
+        self.min_variance_problem = cp.Problem(cp.Minimize(risk), constraints)
+        self.target_problem = cp.Problem(
+            cp.Minimize(risk),
+            constraints + [self.mu @ self.weights >= self.target]
+        )
+
+    @classmethod
+    def get(cls, n_assets: int, min_weight: float = 0.0, max_weight: float = 1.0) -> "FrontierSolver":
+        """Per-process cached solver for a problem shape"""
+        key = (n_assets, float(min_weight), float(max_weight))
+        solver = _solver_cache.get(key)
+        if solver is None:
+            solver = cls(n_assets, min_weight, max_weight)
+            _solver_cache[key] = solver
+        return solver
+
+    def _solve(self, problem: cp.Problem) -> Optional[np.ndarray]:
+        try:
+            # Interior point, no warm start: the solution depends only on the
+            # parameters, not on what this process solved before
+            problem.solve(solver=cp.CLARABEL)
+        except cp.SolverError:
+            return None
+        if problem.status not in (cp.OPTIMAL, cp.OPTIMAL_INACCURATE) or self.weights.value is None:
+            return None
+        weights = np.clip(self.weights.value, self.min_weight, self.max_weight)
+        return weights / weights.sum()
+
+    def frontier(self, mu: np.ndarray, cov: np.ndarray, num_points: int) -> np.ndarray:
+        """
+        Weights along the frontier, from minimum variance to maximum return
+
+        Returns:
+            num_points x n_assets weight matrix
+        """
+        with self._lock:
+            return self._frontier(mu, cov, num_points)
+
+    def _frontier(self, mu: np.ndarray, cov: np.ndarray, num_points: int) -> np.ndarray:
+        self.mu.value = mu
+        self.factor.value = covariance_factor(cov)
+
+        min_var = self._solve(self.min_variance_problem)
+        if min_var is None:
+            raise ValueError("Minimum variance problem could not be solved")
+        max_ret = max_return_weights(mu, self.min_weight, self.max_weight)
+
+        targets = np.linspace(mu @ min_var, mu @ max_ret, num_points)
+        points = np.empty((num_points, self.n_assets))
+        points[0] = min_var
+        points[-1] = max_ret
+        for k in range(1, num_points - 1):
+            self.target.value = targets[k]
+            weights = self._solve(self.target_problem)
+            # A failed solve keeps the previous point, preserving the rank order
+            points[k] = points[k - 1] if weights is None else weights
+        return points
+
+
+def efficient_frontier(
+    mu: np.ndarray,
+    cov: np.ndarray,
+    num_points: int,
+    min_weight: float = 0.0,
+    max_weight: float = 1.0
+) -> np.ndarray:
+    """Point-estimate frontier weights (num_points x n_assets)"""
+    return FrontierSolver.get(len(mu), min_weight, max_weight).frontier(mu, cov, max(num_points, 2))
+
+
+def _sample_frontiers(
+    returns: np.ndarray,
+    seeds: List[np.random.SeedSequence],
+    num_points: int,
+    min_weight: float,
+    max_weight: float
+) -> np.ndarray:
+    """Solve one bootstrap frontier per seed (runs inside pool workers)"""
+    solver = FrontierSolver.get(returns.shape[1], min_weight, max_weight)
+    n_obs = returns.shape[0]
+    frontiers = np.empty((len(seeds), num_points, returns.shape[1]))
+    for s, seed in enumerate(seeds):
+        rows = np.random.default_rng(seed).integers(0, n_obs, size=n_obs)
+        mu, cov = pairwise_moments(returns[rows])
+        frontiers[s] = solver.frontier(np.nan_to_num(mu), nearest_psd(cov), num_points)
+    return frontiers
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    # Sized once by the first caller and reused for the process lifetime:
+    # workers keep their compiled problems, and concurrent requests never
+    # see the pool they are submitting to shut down under them
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers)
+        return _pool
+
+
+def resampled_frontier(
+    returns: np.ndarray,
+    num_points: int,
+    num_samples: int = 100,
+    seed: int = 42,
+    min_weight: float = 0.0,
+    max_weight: float = 1.0,
+    workers: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None
+) -> np.ndarray:
+    """
+    Michaud resampled frontier weights
+
+    Each bootstrap sample gets its own child seed and every solve starts
+    cold, so the result depends only on `seed`, never on how samples are
+    split across workers.
+
+    Args:
+        returns: T x N returns, NaN where unobserved
+        num_points: Points per frontier
+        num_samples: Bootstrap samples
+        seed: Root seed
+        workers: Worker processes (default: CPU count, 1 runs in-process); the
+            shared pool is sized by the first parallel call
+        progress: Called with the fraction of samples solved after each chunk
+
+    Returns:
+        num_points x n_assets rank-averaged weight matrix
+    """
+    num_points = max(num_points, 2)
+    seeds = np.random.SeedSequence(seed).spawn(num_samples)
+    workers = workers or os.cpu_count() or 1
+    # Validate bounds before dispatching work
+    FrontierSolver.get(returns.shape[1], min_weight, max_weight)
+
+    # Contiguous chunks, a few per worker (at most one per sample): the
+    # returns array is pickled once per chunk, progress is reported as
+    # chunks finish, and samples are concatenated back in seed order
+    size = -(-num_samples // min(workers * CHUNKS_PER_WORKER, num_samples))
+    starts = range(0, num_samples, size)
+    chunks: Dict[int, np.ndarray] = {}
+
+    def done(start: int, frontiers: np.ndarray):
+        chunks[start] = frontiers
+        if progress is not None:
+            solved = sum(len(chunk) for chunk in chunks.values())
+            progress(solved / num_samples, f"{solved}/{num_samples} samples")
+
+    args = (num_points, min_weight, max_weight)
+    if workers <= 1:
+        for start in starts:
+            done(start, _sample_frontiers(returns, seeds[start:start + size], *args))
+    else:
+        pool = _get_pool(workers)
+        futures = {
+            pool.submit(_sample_frontiers, returns, seeds[start:start + size], *args): start
+            for start in starts
+        }
+        for future in as_completed(futures):
+            done(futures[future], future.result())
+    frontiers = np.concatenate([chunks[start] for start in starts])
+
+    averaged = frontiers.mean(axis=0)
+    return averaged / averaged.sum(axis=1, keepdims=True)
@@ -1,8 +1,12 @@
 """
 Portfolio optimization algorithms
 """
+import hashlib
+from collections import OrderedDict
 import numpy as np
 import pandas as pd
+from scipy.cluster.hierarchy import linkage, leaves_list
+from scipy.spatial.distance import squareform
 from typing import List, Tuple, Optional
 from app.utils.covariance_estimator import CovarianceEstimator
 
@@ -90,3 +94,246 @@ class RobustOptimizer:
         else:
             return returns.cov()
 
+
+
+def _covariance_key(cov: np.ndarray, *extra) -> tuple:
+    """Hashable cache key for a covariance matrix"""
+    digest = hashlib.sha1(np.ascontiguousarray(cov, dtype=np.float64).tobytes()).hexdigest()
+    return (cov.shape[0], digest) + extra
+
+
+def _bound_weights(weights: np.ndarray, max_weight: Optional[float], min_weight: float = 0.0) -> np.ndarray:
+    """
+    Project long-only weights onto the box [min_weight, max_weight] with sum one
+
+    Weights are rescaled by a common factor t and clipped, with t chosen so
+    that sum(clip(t * w)) = 1: assets strictly inside the box keep their
+    relative proportions, the others sit on a bound. Raises ValueError when
+    the bounds are infeasible for the number of assets, like FrontierSolver.
+    """
+    n = len(weights)
+    upper = 1.0 if max_weight is None else max_weight
+    if upper * n < 1.0 - 1e-9 or min_weight * n > 1.0 + 1e-9 or min_weight > upper:
+        raise ValueError(f"Weight bounds [{min_weight}, {upper}] are infeasible for {n} assets")
+    if min_weight <= 0.0 and upper >= 1.0:
+        return weights
+
+    def bounded(t):
+        return np.clip(t * weights, min_weight, upper)
+
+    # sum(bounded(t)) is nondecreasing in t, from n * min_weight at t = 0 up
+    # to n * upper once every positive weight is capped
+    positive = weights[weights > 0]
+    low, high = 0.0, upper / positive.min() if len(positive) else 1.0
+    for _ in range(200):
+        mid = 0.5 * (low + high)
+        if bounded(mid).sum() < 1.0:
+            low = mid
+        else:
+            high = mid
+    w = bounded(high)
+    # Absorb the bisection residual in the assets strictly inside the box
+    free = (w > min_weight) & (w < upper)
+    if free.any():
+        w[free] += (1.0 - w.sum()) * w[free] / w[free].sum()
+    return w
+
+
+class HRPOptimizer:
+    """
+    Hierarchical Risk Parity (Lopez de Prado)
+
+    Assets are clustered on the correlation distance, ordered along the
+    dendrogram and weights are split top-down by inverse cluster variance.
+    No solver is involved; the clustering is cached per covariance matrix so
+    repeated calls on the same data only redo the bisection.
+    """
+
+    def __init__(self, linkage_method: str = "single", cache_size: int = 32):
+        self.linkage_method = linkage_method
+        self.cache_size = cache_size
+        self._order_cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+
+    def cluster_order(self, cov: np.ndarray) -> np.ndarray:
+        """Quasi-diagonal ordering of the assets (leaves of the cluster tree)"""
+        key = _covariance_key(cov, self.linkage_method)
+        order = self._order_cache.get(key)
+        if order is not None:
+            self._order_cache.move_to_end(key)
+            return order
+
+        std = np.sqrt(np.diag(cov))
+        corr = np.clip(cov / np.outer(std, std), -1.0, 1.0)
+        dist = np.sqrt(np.clip(0.5 * (1.0 - corr), 0.0, None))
+        np.fill_diagonal(dist, 0.0)
+        link = linkage(squareform(dist, checks=False), method=self.linkage_method)
+        order = leaves_list(link)
+
+        self._order_cache[key] = order
+        if len(self._order_cache) > self.cache_size:
+            self._order_cache.popitem(last=False)
+        return order
+
+    @staticmethod
+    def _cluster_variance(cov: np.ndarray, items: np.ndarray) -> float:
+        sub = cov[np.ix_(items, items)]
+        ivp = 1.0 / np.diag(sub)
+        ivp /= ivp.sum()
+        return float(ivp @ sub @ ivp)
+
+    def allocate(self, cov: np.ndarray) -> np.ndarray:
+        """HRP weights for a covariance matrix"""
+        n = cov.shape[0]
+        if n == 1:
+            return np.ones(1)
+        order = self.cluster_order(cov)
+        weights = np.ones(n)
+        clusters = [order]
+        while clusters:
+            next_clusters = []
+            for items in clusters:
+                if len(items) < 2:
+                    continue
+                half = len(items) // 2
+                left, right = items[:half], items[half:]
+                var_left = self._cluster_variance(cov, left)
+                var_right = self._cluster_variance(cov, right)
+                alpha = 1.0 - var_left / (var_left + var_right)
+                weights[left] *= alpha
+                weights[right] *= 1.0 - alpha
+                next_clusters.extend([left, right])
+            clusters = next_clusters
+        return weights / weights.sum()
+
+    def optimize(
+        self,
+        returns: pd.DataFrame,
+        cov: Optional[pd.DataFrame] = None,
+        constraints: dict = None
+    ) -> Tuple[np.ndarray, float, float]:
+        """
+        Allocate portfolio using Hierarchical Risk Parity
+
+        Args:
+            returns: DataFrame with returns (columns = assets, rows = time)
+            cov: Pre-estimated covariance (default: sample covariance)
+            constraints: Optional {'max_weight', 'min_weight'} bounds
+
+        Returns:
+            weights, expected_return, volatility
+        """
+        cov_matrix = (CovarianceEstimator.estimate_sample(returns) if cov is None else cov).values
+        weights = self.allocate(cov_matrix)
+        constraints = constraints or {}
+        weights = _bound_weights(weights, constraints.get('max_weight'), constraints.get('min_weight', 0.0))
+        expected_return = float(returns.mean().values @ weights)
+        volatility = float(np.sqrt(weights @ cov_matrix @ weights))
+        return weights, expected_return, volatility
+
+
+class RiskParityOptimizer:
+    """
+    Equal Risk Contribution (risk budgeting)
+
+    Solves  min ½ yᵀΣy − bᵀlog(y)  over y > 0, whose optimum normalised to
+    sum to one gives risk contributions proportional to the budgets b.
+    Newton's method (one linear solve per iteration) is used first, with
+    cyclical coordinate descent as a fallback.
+    """
+
+    def __init__(self, tol: float = 1e-10, max_iter: int = 100, max_ccd_sweeps: int = 10000):
+        self.tol = tol
+        self.max_iter = max_iter
+        self.max_ccd_sweeps = max_ccd_sweeps
+
+    def _newton(self, cov: np.ndarray, budgets: np.ndarray, y: np.ndarray) -> Optional[np.ndarray]:
+        def objective(v):
+            return 0.5 * v @ cov @ v - budgets @ np.log(v)
+
+        f = objective(y)
+        for _ in range(self.max_iter):
+            grad = cov @ y - budgets / y
+            if np.max(np.abs(grad * y)) < self.tol:
+                return y
+            hess = cov + np.diag(budgets / y ** 2)
+            step = np.linalg.solve(hess, -grad)
+            # Backtrack to stay inside y > 0 and keep decreasing the objective
+            t = 1.0
+            negative = step < 0
+            if negative.any():
+                t = min(1.0, 0.99 * np.min(-y[negative] / step[negative]))
+            while t > 1e-12:
+                candidate = y + t * step
+                f_candidate = objective(candidate)
+                if f_candidate <= f:
+                    break
+                t *= 0.5
+            else:
+                return None
+            y, f = candidate, f_candidate
+        return None
+
+    def _coordinate_descent(self, cov: np.ndarray, budgets: np.ndarray, y: np.ndarray) -> np.ndarray:
+        diag = np.diag(cov)
+        cov_y = cov @ y
+        for _ in range(self.max_ccd_sweeps):
+            max_change = 0.0
+            for i in range(len(y)):
+                # Closed-form positive root of  σ_ii y_i² + c_i y_i − b_i = 0
+                c = cov_y[i] - diag[i] * y[i]
+                new_yi = (-c + np.sqrt(c * c + 4.0 * diag[i] * budgets[i])) / (2.0 * diag[i])
+                delta = new_yi - y[i]
+                if delta:
+                    cov_y += cov[:, i] * delta
+                    y[i] = new_yi
+                    max_change = max(max_change, abs(delta) / new_yi)
+            if max_change < self.tol:
+                break
+        return y
+
+    def allocate(self, cov: np.ndarray, risk_budgets: Optional[np.ndarray] = None) -> np.ndarray:
+        """Risk parity weights for a covariance matrix"""
+        n = cov.shape[0]
+        budgets = np.full(n, 1.0 / n) if risk_budgets is None else np.asarray(risk_budgets, dtype=float)
+        budgets = budgets / budgets.sum()
+        # Inverse-volatility start is exact for uncorrelated assets
+        y0 = np.sqrt(budgets) / np.sqrt(np.diag(cov))
+        y0 *= np.sqrt(1.0 / (y0 @ cov @ y0))
+        y = self._newton(cov, budgets, y0.copy())
+        if y is None:
+            y = self._coordinate_descent(cov, budgets, y0.copy())
+        return y / y.sum()
+
+    @staticmethod
+    def risk_contributions(weights: np.ndarray, cov: np.ndarray) -> np.ndarray:
+        """Fraction of portfolio variance contributed by each asset"""
+        contrib = weights * (cov @ weights)
+        return contrib / contrib.sum()
+
+    def optimize(
+        self,
+        returns: pd.DataFrame,
+        cov: Optional[pd.DataFrame] = None,
+        risk_budgets: Optional[np.ndarray] = None,
+        constraints: dict = None
+    ) -> Tuple[np.ndarray, float, float]:
+        """
+        Allocate portfolio using Equal Risk Contribution
+
+        Args:
+            returns: DataFrame with returns (columns = assets, rows = time)
+            cov: Pre-estimated covariance (default: sample covariance)
+            risk_budgets: Target risk shares (default: equal)
+            constraints: Optional {'max_weight', 'min_weight'} bounds; assets
+                pushed onto a bound no longer match their risk budget exactly
+
+        Returns:
+            weights, expected_return, volatility
+        """
+        cov_matrix = (CovarianceEstimator.estimate_sample(returns) if cov is None else cov).values
+        weights = self.allocate(cov_matrix, risk_budgets)
+        constraints = constraints or {}
+        weights = _bound_weights(weights, constraints.get('max_weight'), constraints.get('min_weight', 0.0))
+        expected_return = float(returns.mean().values @ weights)
+        volatility = float(np.sqrt(weights @ cov_matrix @ weights))
+        return weights, expected_return, volatility
@@ -0,0 +1,136 @@
+"""
+Calendar-aligned returns with a validity mask
+
+Casablanca names have gaps, suspensions and different listing dates.
+Instead of dropping every date where one symbol is missing, prices are
+aligned onto the market trading calendar and a boolean mask records which
+returns are observed, so estimators can use all available history.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func
+
+from app.database.models import MarketIndex, StockPrice
+
+DEFAULT_CALENDAR_INDEX = "MASI"
+
+
+@dataclass
+class AlignedReturns:
+    """Returns on a common calendar (NaN where unobserved) and their validity mask"""
+    returns: pd.DataFrame
+    mask: pd.DataFrame
+
+    def tail(self, periods: int) -> "AlignedReturns":
+        """Keep the last `periods` calendar days"""
+        return AlignedReturns(self.returns.tail(periods), self.mask.tail(periods))
+
+    def observations(self) -> pd.Series:
+        """Number of observed returns per symbol"""
+        return self.mask.sum()
+
+
+def trading_calendar(
+    db,
+    index_name: str = DEFAULT_CALENDAR_INDEX,
+    start: Optional[datetime] = None
+) -> pd.DatetimeIndex:
+    """
+    Trading days derived from the market index history
+
+    Stock price dates after the last index date extend the calendar, so
+    prices refreshed after the last index load are not dropped; with no
+    index loaded at all, the union of stored stock price dates is used.
+    """
+    query = db.query(MarketIndex.date).filter(MarketIndex.index_name == index_name)
+    if start is not None:
+        query = query.filter(MarketIndex.date >= start)
+    dates = [row[0] for row in query.distinct().all()]
+
+    last_index_date = db.query(func.max(MarketIndex.date)).filter(
+        MarketIndex.index_name == index_name
+    ).scalar()
+    query = db.query(StockPrice.date)
+    if last_index_date is not None:
+        query = query.filter(StockPrice.date > last_index_date)
+    if start is not None:
+        query = query.filter(StockPrice.date >= start)
+    dates += [row[0] for row in query.distinct().all()]
+    return pd.DatetimeIndex(sorted(dates), name='date')
+
+
+def load_prices(db, symbols: List[str], start: Optional[datetime] = None) -> pd.DataFrame:
+    """Adjusted close prices (falling back to close), one column per symbol"""
+    query = db.query(
+        StockPrice.symbol,
+        StockPrice.date,
+        StockPrice.adjusted_close,
+        StockPrice.close
+    ).filter(StockPrice.symbol.in_(symbols))
+    if start is not None:
+        query = query.filter(StockPrice.date >= start)
+    prices = pd.DataFrame(query.all(), columns=['symbol', 'date', 'adjusted_close', 'close'])
+    prices['price'] = prices['adjusted_close'].fillna(prices['close'])
+    return prices.pivot_table(index='date', columns='symbol', values='price').sort_index()
+
+
+def align_returns(prices: pd.DataFrame, calendar: pd.DatetimeIndex) -> AlignedReturns:
+    """
+    Simple returns on the calendar
+
+    A return is observed only when the price is present on both the day and
+    the previous trading day, so every observed return spans one session.
+    Days a symbol did not trade and dates before its listing are masked out
+    rather than forward-filled.
+    """
+    aligned = prices.reindex(calendar)
+    values = aligned.to_numpy(dtype=float)
+    present = ~np.isnan(values)
+
+    returns = np.full_like(values, np.nan)
+    valid = np.zeros_like(present)
+    if len(values) > 1:
+        valid[1:] = present[1:] & present[:-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns[1:] = values[1:] / values[:-1] - 1.0
+        returns[~valid] = np.nan
+
+    index = calendar[1:]
+    columns = aligned.columns
+    return AlignedReturns(
+        returns=pd.DataFrame(returns[1:], index=index, columns=columns),
+        mask=pd.DataFrame(valid[1:], index=index, columns=columns)
+    )
+
+
+def load_aligned_returns(
+    db,
+    symbols: List[str],
+    lookback_period: int,
+    index_name: str = DEFAULT_CALENDAR_INDEX,
+    skip_missing: bool = False
+) -> AlignedReturns:
+    """
+    Load the last `lookback_period` trading days of aligned returns
+
+    Args:
+        skip_missing: Leave out symbols without prices in the window
+            instead of raising
+
+    Raises:
+        ValueError: if a symbol has no stored prices (unless skip_missing)
+    """
+    calendar = trading_calendar(db, index_name)
+    if len(calendar) > lookback_period + 1:
+        calendar = calendar[-(lookback_period + 1):]
+    start = calendar[0].to_pydatetime() if len(calendar) else None
+
+    prices = load_prices(db, symbols, start=start)
+    missing = [s for s in symbols if s not in prices.columns]
+    if missing and not skip_missing:
+        raise ValueError(f"No price data for symbols: {missing}")
+    return align_returns(prices[[s for s in symbols if s in prices.columns]], calendar)
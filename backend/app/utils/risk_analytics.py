@@ -0,0 +1,113 @@
+"""
+Batched portfolio risk analytics
+
+Every metric is computed for a whole stack of weight vectors at once
+(P portfolios x N assets) against one covariance matrix and one scenario
+set, so scoring thousands of portfolios is a handful of matrix products.
+"""
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+TRADING_DAYS = 252
+
+
+@dataclass
+class BatchRiskMetrics:
+    """Risk metrics for P portfolios; vectors have shape (P,), matrices (P, N)"""
+    expected_return: np.ndarray
+    volatility: np.ndarray
+    sharpe_ratio: np.ndarray
+    var: np.ndarray
+    cvar: np.ndarray
+    diversification_ratio: np.ndarray
+    hhi: np.ndarray
+    marginal_risk: np.ndarray
+    risk_contributions: np.ndarray
+
+
+def scenario_var_cvar(pnl: np.ndarray, alpha: float = 0.05):
+    """
+    Historical VaR and CVaR, reported as positive losses
+
+    Args:
+        pnl: P x T scenario returns, one row per portfolio
+        alpha: Tail probability (0.05 for 95%)
+
+    Returns:
+        var (P,), cvar (P,)
+    """
+    n_scenarios = pnl.shape[1]
+    k = max(int(np.ceil(alpha * n_scenarios)), 1)
+    # Partial sort: only the k worst scenarios per row need ordering
+    worst = np.partition(pnl, k - 1, axis=1)[:, :k]
+    var = -worst.max(axis=1)
+    cvar = -worst.mean(axis=1)
+    return var, cvar
+
+
+def batch_risk_metrics(
+    weights: np.ndarray,
+    cov: np.ndarray,
+    mean: np.ndarray,
+    scenarios: Optional[np.ndarray] = None,
+    alpha: float = 0.05,
+    risk_free_rate: float = 0.0,
+    chunk_size: int = 4096,
+    progress: Optional[Callable[[float, Optional[str]], None]] = None
+) -> BatchRiskMetrics:
+    """
+    Risk metrics for many portfolios at once
+
+    Args:
+        weights: P x N weight matrix (or a single N vector)
+        cov: N x N covariance of periodic returns
+        mean: N expected periodic returns
+        scenarios: T x N return scenarios for VaR/CVaR (skipped if None)
+        alpha: Tail probability for VaR/CVaR
+        risk_free_rate: Annual risk-free rate for the Sharpe ratio
+        chunk_size: Portfolios per scenario block, bounds the P x T buffer
+        progress: Called with the fraction of portfolios done after each block
+
+    Returns:
+        BatchRiskMetrics; Sharpe is annualized, other figures are periodic
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    cov_w = weights @ cov  # P x N, reused for volatility and contributions
+    variance = np.einsum('pn,pn->p', cov_w, weights)
+    volatility = np.sqrt(np.clip(variance, 0.0, None))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        marginal = cov_w / volatility[:, None]
+        contributions = weights * marginal
+        expected_return = weights @ mean
+        excess = expected_return * TRADING_DAYS - risk_free_rate
+        sharpe = excess / (volatility * np.sqrt(TRADING_DAYS))
+        diversification = (weights @ np.sqrt(np.diag(cov))) / volatility
+        # Concentration of the normalized weights; undefined (inf/NaN) for
+        # zero-net long/short books
+        hhi = np.einsum('pn,pn->p', weights, weights) / weights.sum(axis=1) ** 2
+
+    n_portfolios = weights.shape[0]
+    var = np.full(n_portfolios, np.nan)
+    cvar = np.full(n_portfolios, np.nan)
+    if scenarios is not None and len(scenarios):
+        for start in range(0, n_portfolios, chunk_size):
+            block = slice(start, start + chunk_size)
+            var[block], cvar[block] = scenario_var_cvar(weights[block] @ scenarios.T, alpha)
+            if progress is not None:
+                done = min(start + chunk_size, n_portfolios)
+                progress(done / n_portfolios, f"{done}/{n_portfolios} portfolios")
+
+    return BatchRiskMetrics(
+        expected_return=expected_return,
+        volatility=volatility,
+        sharpe_ratio=sharpe,
+        var=var,
+        cvar=cvar,
+        diversification_ratio=diversification,
+        hhi=hhi,
+        marginal_risk=marginal,
+        risk_contributions=contributions
+    )
@@ -1,4 +1,14 @@
 # Scrapers module
-# (Empty - scrapers removed)
+from app.utils.scrapers.http_cache import ResponseCache, CachedResponse
+from app.utils.scrapers.fetcher import AsyncFetcher, FetchResult, HostRateLimiter
+from app.utils.scrapers.market_data import StockHistoryFetcher, refresh_stock_prices
 
-__all__ = []
+__all__ = [
+    "ResponseCache",
+    "CachedResponse",
+    "AsyncFetcher",
+    "FetchResult",
+    "HostRateLimiter",
+    "StockHistoryFetcher",
+    "refresh_stock_prices",
+]
@@ -0,0 +1,157 @@
+"""
+Async HTTP fetcher with connection pooling, bounded concurrency and per-host rate limits
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.utils.scrapers.http_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a single fetch"""
+    url: str
+    status_code: int
+    content: bytes
+    from_cache: bool = False
+
+
+class HostRateLimiter:
+    """Spaces out requests to the same host at a fixed minimum interval"""
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+
+    async def acquire(self, host: str):
+        """Wait until the next request slot for a host"""
+        if not self.interval:
+            return
+        now = asyncio.get_running_loop().time()
+        # Reserve a slot before awaiting so concurrent callers queue behind each other
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class AsyncFetcher:
+    """
+    Pooled async HTTP client
+
+    One `httpx.AsyncClient` is shared for every request, so connections are
+    kept alive across symbols. A semaphore bounds in-flight requests, a
+    per-host limiter keeps request rates polite and, when a cache is given,
+    requests are made conditional on the cached ETag/Last-Modified.
+
+    Use as an async context manager:
+
+        async with AsyncFetcher() as fetcher:
+            results = await fetcher.fetch_many(urls)
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        max_concurrency: Optional[int] = None,
+        rate_limit_per_host: Optional[float] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None
+    ):
+        self.cache = cache
+        self.max_concurrency = max_concurrency or settings.SCRAPER_MAX_CONCURRENCY
+        self.rate_limiter = HostRateLimiter(
+            settings.SCRAPER_RATE_LIMIT_PER_HOST if rate_limit_per_host is None else rate_limit_per_host
+        )
+        self.timeout = timeout or settings.SCRAPER_TIMEOUT
+        self.max_retries = settings.SCRAPER_MAX_RETRIES if max_retries is None else max_retries
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency
+            ),
+            headers={"User-Agent": "PortfolioOptimizerPro/1.0"}
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._client.aclose()
+        self._client = None
+
+    async def fetch(self, url: str, params: Optional[dict] = None) -> FetchResult:
+        """
+        Fetch a URL, answering from the cache on 304 Not Modified
+
+        Raises:
+            httpx.HTTPStatusError: on a non-retryable error status or once
+                retries are exhausted
+        """
+        if self._client is None:
+            raise RuntimeError("AsyncFetcher must be used as an async context manager")
+
+        full_url = str(httpx.URL(url, params=params))
+        cached = self.cache.get(full_url) if self.cache else None
+        headers = cached.conditional_headers() if cached else {}
+        host = urlsplit(full_url).netloc
+
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self.rate_limiter.acquire(host)
+                response = await self._client.get(full_url, headers=headers)
+
+                if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                    delay = self._retry_delay(response, attempt)
+                    logger.warning(f"{response.status_code} from {full_url}, retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                break
+
+        if response.status_code == 304 and cached:
+            return FetchResult(full_url, 304, cached.content, from_cache=True)
+
+        response.raise_for_status()
+        if self.cache:
+            self.cache.put(
+                full_url,
+                response.content,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified")
+            )
+        return FetchResult(full_url, response.status_code, response.content)
+
+    async def fetch_many(
+        self,
+        urls: Iterable[str],
+        params: Optional[Iterable[Optional[dict]]] = None,
+        return_exceptions: bool = False
+    ) -> List[FetchResult]:
+        """Fetch many URLs concurrently, preserving input order"""
+        urls = list(urls)
+        params = list(params) if params is not None else [None] * len(urls)
+        return await asyncio.gather(
+            *(self.fetch(u, p) for u, p in zip(urls, params)),
+            return_exceptions=return_exceptions
+        )
+
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return 0.5 * (2 ** attempt)
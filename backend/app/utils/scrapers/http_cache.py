@@ -0,0 +1,75 @@
+"""
+On-disk HTTP response cache for conditional requests
+"""
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+
+@dataclass
+class CachedResponse:
+    """Cached response body with its validators"""
+    url: str
+    content: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that let the server answer 304 Not Modified"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Stores response bodies and ETag/Last-Modified validators on disk"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Cache key for a fully qualified URL (query string included)"""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, url: str):
+        key = self.key(url)
+        return self.cache_dir / f"{key}.body", self.cache_dir / f"{key}.json"
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Return the cached response for a URL, if any"""
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            content = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        return CachedResponse(
+            url=url,
+            content=content,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified")
+        )
+
+    def put(self, url: str, content: bytes, etag: Optional[str], last_modified: Optional[str]):
+        """Store a response; skipped when the server sent no validators"""
+        if not etag and not last_modified:
+            return
+        body_path, meta_path = self._paths(url)
+        meta = {"url": url, "etag": etag, "last_modified": last_modified}
+        # Write-then-rename so concurrent readers never see a partial file
+        self._atomic_write(body_path, content)
+        self._atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes):
+        tmp_path = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
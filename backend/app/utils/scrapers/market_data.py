@@ -0,0 +1,186 @@
+"""
+Incremental stock price refresh
+
+Only the dates after the latest stored `StockPrice` row are requested for
+each symbol, and all symbols are fetched concurrently through one pooled
+client.
+"""
+import asyncio
+import io
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+from sqlalchemy import func, insert
+
+from app.core.config import settings
+from app.database.models import SessionLocal, StockPrice, bump_data_version
+from app.utils.corporate_actions import apply_pending_adjustments
+from app.utils.scrapers.fetcher import AsyncFetcher
+from app.utils.scrapers.http_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def latest_price_dates(db, symbols: List[str]) -> Dict[str, datetime]:
+    """Latest stored date per symbol, in a single grouped query"""
+    rows = (
+        db.query(StockPrice.symbol, func.max(StockPrice.date))
+        .filter(StockPrice.symbol.in_(symbols))
+        .group_by(StockPrice.symbol)
+        .all()
+    )
+    return {symbol: last_date for symbol, last_date in rows}
+
+
+def parse_history_csv(content: bytes) -> pd.DataFrame:
+    """
+    Parse a CSV price history export
+
+    Returns:
+        DataFrame with date, open, high, low, close, volume columns
+    """
+    df = pd.read_csv(io.BytesIO(content))
+    df.columns = [str(col).strip().lower() for col in df.columns]
+    if 'date' not in df.columns or 'close' not in df.columns:
+        raise ValueError(f"History CSV must contain date and close columns, got {list(df.columns)}")
+
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df['close'] = pd.to_numeric(df['close'], errors='coerce')
+    df = df.dropna(subset=['date', 'close'])
+    for col in ['open', 'high', 'low']:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(df['close']) if col in df.columns else df['close']
+    if 'volume' in df.columns:
+        df['volume'] = pd.to_numeric(df['volume'], errors='coerce').fillna(0).astype(int)
+    else:
+        df['volume'] = 0
+    return df[['date'] + PRICE_COLUMNS].sort_values('date')
+
+
+class StockHistoryFetcher:
+    """Fetches and stores missing price history for many symbols at once"""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        history_path: Optional[str] = None,
+        session_factory=SessionLocal,
+        cache_dir: Optional[str] = None,
+        **fetcher_kwargs
+    ):
+        self.base_url = (base_url or settings.CASABLANCA_BOURSE_BASE_URL).rstrip('/')
+        self.history_path = history_path or settings.STOCK_HISTORY_PATH
+        self.session_factory = session_factory
+        self.cache = ResponseCache(cache_dir or settings.SCRAPER_CACHE_DIR)
+        self.fetcher_kwargs = fetcher_kwargs
+
+    def history_url(self, symbol: str) -> str:
+        """URL of the history export for a symbol"""
+        return self.base_url + self.history_path.format(symbol=symbol)
+
+    async def refresh(self, symbols: List[str], end: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Fetch and store prices newer than what is already in the database
+
+        Args:
+            symbols: Symbols to refresh
+            end: Last date to fetch (default: today)
+
+        Returns:
+            Number of rows inserted per symbol
+        """
+        end = pd.Timestamp(end or datetime.utcnow()).normalize()
+        last_business_day = pd.offsets.BDay().rollback(end)
+
+        db = self.session_factory()
+        try:
+            latest = latest_price_dates(db, symbols)
+        finally:
+            db.close()
+
+        # Symbols already up to date cost nothing
+        pending = [
+            s for s in symbols
+            if s not in latest or pd.Timestamp(latest[s]).normalize() < last_business_day
+        ]
+        inserted = {s: 0 for s in symbols}
+        if not pending:
+            return inserted
+
+        # Only a start date is sent so the URL stays stable between runs and
+        # an unchanged source answers 304 from the conditional cache
+        params = [
+            {"from": (pd.Timestamp(latest[s]) + pd.Timedelta(days=1)).strftime('%Y-%m-%d')}
+            if s in latest else None
+            for s in pending
+        ]
+
+        async with AsyncFetcher(cache=self.cache, **self.fetcher_kwargs) as fetcher:
+            results = await fetcher.fetch_many(
+                [self.history_url(s) for s in pending],
+                params,
+                return_exceptions=True
+            )
+
+        frames = {}
+        for symbol, result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to fetch history for {symbol}: {result}")
+                continue
+            try:
+                df = parse_history_csv(result.content)
+            except ValueError as e:
+                logger.error(f"Failed to parse history for {symbol}: {e}")
+                continue
+            # The source may ignore the date range, so filter locally as well
+            if symbol in latest:
+                df = df[df['date'] > pd.Timestamp(latest[symbol])]
+            df = df[df['date'] < end + pd.Timedelta(days=1)]
+            if not df.empty:
+                frames[symbol] = df
+
+        counts = await asyncio.to_thread(self._store, frames)
+        inserted.update(counts)
+        return inserted
+
+    def _store(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, int]:
+        """Bulk insert new rows through the writer session"""
+        if not frames:
+            return {}
+        db = self.session_factory()
+        try:
+            counts = {}
+            for symbol, df in frames.items():
+                records = [
+                    {
+                        'symbol': symbol,
+                        'date': row.date.to_pydatetime(),
+                        'open': float(row.open),
+                        'high': float(row.high),
+                        'low': float(row.low),
+                        'close': float(row.close),
+                        'volume': int(row.volume),
+                        'adjusted_close': float(row.close)
+                    }
+                    for row in df.itertuples(index=False)
+                ]
+                db.execute(insert(StockPrice), records)
+                counts[symbol] = len(records)
+            bump_data_version(db, 'stock_prices')
+            # New sessions can make announced dividends/splits applicable
+            apply_pending_adjustments(db)
+            db.commit()
+            return counts
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+def refresh_stock_prices(symbols: List[str], **kwargs) -> Dict[str, int]:
+    """Synchronous entry point for scripts and scheduled jobs"""
+    return asyncio.run(StockHistoryFetcher(**kwargs).refresh(symbols))
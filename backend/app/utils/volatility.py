@@ -0,0 +1,352 @@
+"""
+Batched GARCH(1,1) volatility for the whole universe
+
+The variance recursion runs over all assets at once (one vector operation
+per day instead of a Python loop per asset), and unobserved returns are
+skipped through the validity mask of the aligned returns: a missing day
+substitutes its expected squared return and is left out of the likelihood.
+
+Variance targeting fixes ω = v (1 - α - β) with v the sample variance, and
+the model is parameterized by persistence s = α + β and share
+p = α / (α + β) so stationarity is a plain bound. The negative
+log-likelihood of a block of assets is a sum of independent terms, so one
+L-BFGS-B run with analytic gradients fits the whole block; blocks are
+spread across processes. Fits are stored per symbol and the next run starts
+from them, which usually converges in a handful of iterations.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy.optimize import minimize
+from sqlalchemy import insert
+
+from app.database.models import VolatilityModel
+from app.utils.returns_builder import load_aligned_returns
+
+DEFAULT_PERSISTENCE = 0.95
+DEFAULT_SHARE = 0.05 / 0.95  # α = 0.05, β = 0.90
+PERSISTENCE_BOUNDS = (1e-4, 0.9999)
+SHARE_BOUNDS = (1e-4, 1.0)
+
+
+def _mask_for(returns: np.ndarray, mask: Optional[np.ndarray]) -> np.ndarray:
+    return ~np.isnan(returns) if mask is None else mask.astype(bool)
+
+
+@dataclass
+class GARCHFit:
+    """Fitted GARCH(1,1) parameters and end-of-sample state, one entry per asset"""
+    omega: np.ndarray
+    alpha: np.ndarray
+    beta: np.ndarray
+    mean: np.ndarray
+    long_run_variance: np.ndarray
+    last_variance: np.ndarray  # σ²_T
+    last_innovation: np.ndarray  # (r_T - mean)², σ²_T if the last day was unobserved
+    log_likelihood: np.ndarray
+
+    @property
+    def persistence(self) -> np.ndarray:
+        return self.alpha + self.beta
+
+    @property
+    def share(self) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.nan_to_num(self.alpha / self.persistence, nan=DEFAULT_SHARE)
+
+    def next_variance(self) -> np.ndarray:
+        """One-step-ahead conditional variance σ²_{T+1}"""
+        return self.omega + self.alpha * self.last_innovation + self.beta * self.last_variance
+
+    def forecast_volatility(self, horizon: int = 1) -> np.ndarray:
+        """Conditional volatility `horizon` days ahead"""
+        next_var = self.next_variance()
+        variance = self.long_run_variance + self.persistence ** (horizon - 1) * (next_var - self.long_run_variance)
+        return np.sqrt(variance)
+
+    def update(self, daily_returns: np.ndarray, mask: Optional[np.ndarray] = None) -> "GARCHFit":
+        """Roll the filter forward one day with fixed parameters (O(N))"""
+        observed = _mask_for(daily_returns, mask)
+        variance = self.next_variance()
+        innovation = np.where(observed, (np.nan_to_num(daily_returns) - self.mean) ** 2, variance)
+        return GARCHFit(
+            omega=self.omega,
+            alpha=self.alpha,
+            beta=self.beta,
+            mean=self.mean,
+            long_run_variance=self.long_run_variance,
+            last_variance=variance,
+            last_innovation=innovation,
+            log_likelihood=self.log_likelihood
+        )
+
+
+def _garch_likelihood(
+    s: np.ndarray,
+    p: np.ndarray,
+    r2: np.ndarray,
+    mask: np.ndarray,
+    long_run: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-asset Gaussian negative log-likelihood (constants dropped) and its
+    gradient with respect to s and p
+
+    The variance recursion and its derivatives run over all assets at once.
+    """
+    alpha, beta = s * p, s * (1.0 - p)
+    omega = long_run * (1.0 - s)
+
+    n = r2.shape[1]
+    variance = long_run.copy()
+    d_s = np.zeros(n)
+    d_p = np.zeros(n)
+    nll = np.zeros(n)
+    grad_s = np.zeros(n)
+    grad_p = np.zeros(n)
+
+    for t in range(r2.shape[0]):
+        if t > 0:
+            observed = mask[t - 1]
+            # Unobserved days substitute the expected squared return σ²
+            innovation = np.where(observed, r2[t - 1], variance)
+            carry = beta + np.where(observed, 0.0, alpha)
+            new_d_s = -long_run + p * innovation + (1.0 - p) * variance + carry * d_s
+            new_d_p = s * (innovation - variance) + carry * d_p
+            variance = omega + alpha * innovation + beta * variance
+            d_s, d_p = new_d_s, new_d_p
+
+        m = mask[t]
+        ratio = r2[t] / variance
+        nll += np.where(m, 0.5 * (np.log(variance) + ratio), 0.0)
+        score = np.where(m, 0.5 * (1.0 - ratio) / variance, 0.0)
+        grad_s += score * d_s
+        grad_p += score * d_p
+
+    return nll, grad_s, grad_p
+
+
+def _block_objective(
+    params: np.ndarray,
+    r2: np.ndarray,
+    mask: np.ndarray,
+    long_run: np.ndarray
+) -> Tuple[float, np.ndarray]:
+    """Summed NLL of a block of assets, params = [s_1..s_N, p_1..p_N]"""
+    n = r2.shape[1]
+    nll, grad_s, grad_p = _garch_likelihood(params[:n], params[n:], r2, mask, long_run)
+    return float(nll.sum()), np.concatenate([grad_s, grad_p])
+
+
+def _filter_state(
+    r2: np.ndarray,
+    mask: np.ndarray,
+    omega: np.ndarray,
+    alpha: np.ndarray,
+    beta: np.ndarray,
+    long_run: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """End-of-sample (σ²_T, innovation_T) for fixed parameters"""
+    variance = long_run.copy()
+    for t in range(1, r2.shape[0]):
+        innovation = np.where(mask[t - 1], r2[t - 1], variance)
+        variance = omega + alpha * innovation + beta * variance
+    last_innovation = np.where(mask[-1], r2[-1], variance)
+    return variance, last_innovation
+
+
+def _fit_block(
+    returns: np.ndarray,
+    mask: np.ndarray,
+    start_persistence: np.ndarray,
+    start_share: np.ndarray,
+    max_iter: int
+) -> GARCHFit:
+    """Fit one block of assets with a single L-BFGS-B run"""
+    n = returns.shape[1]
+    counts = mask.sum(axis=0)
+    x = np.where(mask, returns, 0.0)
+    means = x.sum(axis=0) / np.maximum(counts, 1)
+    centered = np.where(mask, returns - means, 0.0)
+    r2 = centered ** 2
+    long_run = np.maximum(r2.sum(axis=0) / np.maximum(counts - 1, 1), 1e-12)
+
+    x0 = np.concatenate([
+        np.clip(start_persistence, *PERSISTENCE_BOUNDS),
+        np.clip(start_share, *SHARE_BOUNDS)
+    ])
+    bounds = [PERSISTENCE_BOUNDS] * n + [SHARE_BOUNDS] * n
+    result = minimize(
+        _block_objective,
+        x0,
+        args=(r2, mask, long_run),
+        jac=True,
+        method="L-BFGS-B",
+        bounds=bounds,
+        options={"maxiter": max_iter}
+    )
+    s, p = result.x[:n], result.x[n:]
+    alpha, beta = s * p, s * (1.0 - p)
+    omega = long_run * (1.0 - s)
+
+    last_variance, last_innovation = _filter_state(r2, mask, omega, alpha, beta, long_run)
+    nll, _, _ = _garch_likelihood(s, p, r2, mask, long_run)
+    return GARCHFit(
+        omega=omega,
+        alpha=alpha,
+        beta=beta,
+        mean=means,
+        long_run_variance=long_run,
+        last_variance=last_variance,
+        last_innovation=last_innovation,
+        log_likelihood=-nll
+    )
+
+
+def fit_garch_batch(
+    returns: np.ndarray,
+    mask: Optional[np.ndarray] = None,
+    start: Optional[GARCHFit] = None,
+    workers: Optional[int] = None,
+    block_size: int = 32,
+    max_iter: int = 200
+) -> GARCHFit:
+    """
+    Fit GARCH(1,1) for every asset
+
+    Args:
+        returns: T x N returns, oldest first, NaN where unobserved
+        mask: Optional validity mask
+        start: Previous fit used as starting point, NaN where unknown
+        workers: Processes (default: CPU count, 1 runs in-process)
+        block_size: Assets per L-BFGS-B problem / task
+        max_iter: Iteration cap per block
+
+    Returns:
+        GARCHFit with one entry per asset
+    """
+    mask = _mask_for(returns, mask)
+    n = returns.shape[1]
+    start_persistence = np.full(n, DEFAULT_PERSISTENCE)
+    start_share = np.full(n, DEFAULT_SHARE)
+    if start is not None:
+        # Symbols without a previous fit (NaN) keep the defaults
+        known = np.isfinite(start.persistence)
+        start_persistence[known] = start.persistence[known]
+        start_share[known] = start.share[known]
+
+    blocks = [slice(i, min(i + block_size, n)) for i in range(0, n, block_size)]
+    args = [
+        (returns[:, b], mask[:, b], start_persistence[b], start_share[b], max_iter)
+        for b in blocks
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(blocks))
+    if workers <= 1:
+        fits = [_fit_block(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fits = list(pool.map(_fit_block, *zip(*args)))
+
+    return GARCHFit(**{
+        name: np.concatenate([getattr(fit, name) for fit in fits])
+        for name in GARCHFit.__dataclass_fields__
+    })
+
+
+def _fit_from_rows(symbols: List[str], rows: dict) -> GARCHFit:
+    def column(name):
+        return np.array([
+            getattr(rows[s], name) if s in rows else np.nan for s in symbols
+        ], dtype=float)
+    return GARCHFit(
+        omega=column('omega'),
+        alpha=column('alpha'),
+        beta=column('beta'),
+        mean=column('mean_return'),
+        long_run_variance=column('long_run_variance'),
+        last_variance=column('last_variance'),
+        last_innovation=column('last_innovation'),
+        log_likelihood=column('log_likelihood')
+    )
+
+
+def load_garch_fits(db, symbols: List[str]) -> GARCHFit:
+    """Stored fits in `symbols` order, NaN for symbols never fitted"""
+    rows = {
+        row.symbol: row
+        for row in db.query(VolatilityModel).filter(VolatilityModel.symbol.in_(symbols)).all()
+    }
+    return _fit_from_rows(symbols, rows)
+
+
+def save_garch_fits(
+    db,
+    symbols: List[str],
+    fit: GARCHFit,
+    as_of: datetime,
+    observations: np.ndarray
+):
+    """Replace the stored fits of `symbols` in bulk. The caller commits."""
+    forecast = fit.forecast_volatility()
+    db.query(VolatilityModel).filter(
+        VolatilityModel.symbol.in_(symbols)
+    ).delete(synchronize_session=False)
+    db.execute(
+        insert(VolatilityModel),
+        [
+            {
+                'symbol': symbol,
+                'omega': float(fit.omega[i]),
+                'alpha': float(fit.alpha[i]),
+                'beta': float(fit.beta[i]),
+                'mean_return': float(fit.mean[i]),
+                'long_run_variance': float(fit.long_run_variance[i]),
+                'last_variance': float(fit.last_variance[i]),
+                'last_innovation': float(fit.last_innovation[i]),
+                'forecast_volatility': float(forecast[i]),
+                'log_likelihood': float(fit.log_likelihood[i]),
+                'observations': int(observations[i]),
+                'as_of': as_of,
+                'updated_at': datetime.utcnow()
+            }
+            for i, symbol in enumerate(symbols)
+        ]
+    )
+
+
+def refresh_volatility(
+    db,
+    symbols: List[str],
+    lookback_period: int,
+    min_observations: int = 100,
+    workers: Optional[int] = None
+) -> Tuple[List[str], GARCHFit]:
+    """
+    Refit GARCH(1,1) for `symbols`, warm-started from the stored fits
+
+    Symbols without prices in the window (e.g. just listed in stock_info)
+    or with fewer than `min_observations` returns are skipped. The caller
+    commits.
+
+    Returns:
+        Fitted symbols and their fits
+    """
+    aligned = load_aligned_returns(db, symbols, lookback_period, skip_missing=True)
+    observations = aligned.observations()
+    fitted = [s for s in symbols if observations.get(s, 0) >= min_observations]
+    if not fitted:
+        return [], _fit_from_rows([], {})
+
+    fit = fit_garch_batch(
+        aligned.returns[fitted].to_numpy(dtype=float),
+        aligned.mask[fitted].to_numpy(dtype=bool),
+        start=load_garch_fits(db, fitted),
+        workers=workers
+    )
+    as_of = aligned.returns.index[-1].to_pydatetime()
+    save_garch_fits(db, fitted, fit, as_of, observations[fitted].to_numpy())
+    return fitted, fit
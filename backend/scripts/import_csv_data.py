@@ -9,7 +9,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
-from app.database.models import StockInfo, StockPrice, SessionLocal, init_db
+from app.database.models import StockInfo, StockPrice, CorporateAction, SessionLocal, engine, init_db, bump_data_version
+from app.utils.corporate_actions import apply_pending_adjustments, DIVIDEND, SPLIT
+from app.database.engine import is_sqlite
+from sqlalchemy import text
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -163,6 +166,7 @@ def import_csv_file(csv_path: Path, symbol: str) -> tuple[int, int]:
                 currency='MAD'
             )
             db.add(stock_info)
+            bump_data_version(db, 'stock_info')
             db.commit()
             logger.info(f"   ✅ Created stock info for {symbol}")
         
@@ -189,11 +193,13 @@ def import_csv_file(csv_path: Path, symbol: str) -> tuple[int, int]:
                 low=float(row['low']),
                 close=float(row['close']),
                 volume=int(row['volume']),
-                adjusted_close=float(row['close'])  # Assume no adjustments for now
+                adjusted_close=float(row['close'])  # Corporate actions are applied after the import
             )
             db.add(stock_price)
             rows_imported += 1
         
+        if rows_imported:
+            bump_data_version(db, 'stock_prices')
         db.commit()
         
         logger.info(f"   ✅ Imported {rows_imported} rows, skipped {rows_skipped} duplicates")
@@ -212,6 +218,81 @@ def import_csv_file(csv_path: Path, symbol: str) -> tuple[int, int]:
         db.close()
 
 
+CORPORATE_ACTIONS_FILE = "corporate_actions.csv"
+
+
+def import_corporate_actions(csv_path: Path) -> int:
+    """
+    Import dividends and splits
+    
+    Expected columns: symbol, ex_date, type (dividend/split), amount, ratio
+    
+    Returns:
+        Number of new events
+    """
+    db = SessionLocal()
+    
+    try:
+        logger.info(f"\n📄 Importing corporate actions from {csv_path.name}...")
+        df = pd.read_csv(csv_path)
+        df.columns = [str(col).strip().lower() for col in df.columns]
+        df = df.rename(columns={'type': 'action_type'})
+        df['symbol'] = df['symbol'].astype(str).str.upper().str.strip()
+        df['ex_date'] = df['ex_date'].apply(parse_date)
+        df['action_type'] = df['action_type'].astype(str).str.lower().str.strip()
+        df = df.dropna(subset=['ex_date'])
+        df = df[df['action_type'].isin([DIVIDEND, SPLIT])]
+        
+        existing = {
+            (symbol, ex_date, action_type)
+            for symbol, ex_date, action_type in db.query(
+                CorporateAction.symbol, CorporateAction.ex_date, CorporateAction.action_type
+            ).all()
+        }
+        
+        new_events = 0
+        for _, row in df.iterrows():
+            key = (row['symbol'], row['ex_date'].to_pydatetime(), row['action_type'])
+            if key in existing:
+                continue
+            db.add(CorporateAction(
+                symbol=row['symbol'],
+                ex_date=row['ex_date'].to_pydatetime(),
+                action_type=row['action_type'],
+                amount=float(row['amount']) if pd.notna(row.get('amount')) else None,
+                ratio=float(row['ratio']) if pd.notna(row.get('ratio')) else None
+            ))
+            existing.add(key)
+            new_events += 1
+        
+        db.commit()
+        logger.info(f"   ✅ Imported {new_events} new corporate actions")
+        return new_events
+        
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Error importing {csv_path.name}: {str(e)}")
+        return 0
+    finally:
+        db.close()
+
+
+def adjust_prices(imported_symbols: list) -> int:
+    """Re-adjust symbols with new events or newly imported history"""
+    db = SessionLocal()
+    try:
+        rows = apply_pending_adjustments(db, imported_symbols)
+        db.commit()
+        if rows:
+            logger.info(f"   ✅ Re-adjusted {rows} price rows for corporate actions")
+        return rows
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 def main():
     """Main import function"""
     print("\n" + "📥"*30)
@@ -226,7 +307,7 @@ def main():
     data_dir.mkdir(parents=True, exist_ok=True)
     
     # Find CSV files
-    csv_files = list(data_dir.glob("*.csv"))
+    csv_files = [f for f in data_dir.glob("*.csv") if f.name != CORPORATE_ACTIONS_FILE]
     
     if not csv_files:
         print(f"❌ No CSV files found in {data_dir}")
@@ -241,6 +322,7 @@ def main():
     # Import each file
     total_imported = 0
     total_skipped = 0
+    imported_symbols = []
     
     for csv_file in sorted(csv_files):
         # Extract symbol from filename (e.g., ATW.csv -> ATW)
@@ -249,6 +331,19 @@ def main():
         imported, skipped = import_csv_file(csv_file, symbol)
         total_imported += imported
         total_skipped += skipped
+        if imported:
+            imported_symbols.append(symbol)
+    
+    # Dividends and splits, then adjusted_close for the affected symbols only
+    actions_file = data_dir / CORPORATE_ACTIONS_FILE
+    if actions_file.exists():
+        import_corporate_actions(actions_file)
+    adjust_prices(imported_symbols)
+    
+    # Fold the WAL back into the main file so readers start from a compact log
+    if is_sqlite(str(engine.url)):
+        with engine.connect() as conn:
+            conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
     
     print("\n" + "="*60)
     print("✅ Import completed!")
@@ -0,0 +1,449 @@
+"""
+Load testing harness for the optimization API
+
+Boots the FastAPI app (uvicorn subprocess) against a synthetic SQLite
+dataset, replays a weighted mix of realistic requests at a fixed
+concurrency (closed loop) or a fixed arrival rate (open loop, Poisson),
+and reports throughput, latency percentiles and error rates.
+
+Examples:
+    python scripts/load_test.py --concurrency 16 --duration 60
+    python scripts/load_test.py --rate 20 --duration 120 --workers 4
+    python scripts/load_test.py --url http://staging:8000 --concurrency 8
+    python scripts/load_test.py --mix '{"hrp": 5, "efficient_frontier": 1}' --json report.json
+    python scripts/load_test.py --mix '{"mean_variance": 1, "cvar": 1, "robust": 1}'
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import tempfile
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+import pandas as pd
+
+# Relative weight of each endpoint in the request mix (override with --mix).
+# mean_variance, cvar and robust are still stubs that answer without
+# computing anything; they are left out so they do not inflate throughput.
+DEFAULT_MIX = {
+    "hrp": 3,
+    "risk_parity": 3,
+    "efficient_frontier": 1,
+    "resampled_frontier": 1,
+    "analytics": 2,
+    "job": 1,
+    "history": 4,
+}
+
+ENDPOINTS = {
+    "mean_variance": "/api/v1/optimize/mean-variance",
+    "cvar": "/api/v1/optimize/cvar",
+    "robust": "/api/v1/optimize/robust",
+    "hrp": "/api/v1/optimize/hrp",
+    "risk_parity": "/api/v1/optimize/risk-parity",
+    "efficient_frontier": "/api/v1/efficient-frontier",
+    "resampled_frontier": "/api/v1/efficient-frontier",
+    "analytics": "/api/v1/analytics/portfolios",
+    "job": "/api/v1/jobs",
+    "history": "/api/v1/stocks/{symbol}/history",
+}
+
+# Job traffic: heavy computations submitted to /jobs, polled to completion
+JOB_MIX = {"efficient_frontier": 2, "portfolio_analytics": 1, "hrp": 1}
+JOB_POLL_INTERVAL = 0.25
+
+LOOKBACKS = [63, 126, 252, 504, 756]
+
+
+# ---------------------------------------------------------------------------
+# Synthetic dataset
+# ---------------------------------------------------------------------------
+
+def build_synthetic_database(path: Path, n_symbols: int, n_days: int, seed: int) -> List[str]:
+    """
+    Create a SQLite database with factor-model prices, a MASI calendar,
+    gaps for suspensions and late listings
+
+    Returns:
+        Generated symbols
+    """
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    from sqlalchemy import insert
+    from app.database.engine import build_engine
+    from app.database.models import Base, StockInfo, StockPrice, MarketIndex, DataVersion
+
+    engine = build_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=datetime(2024, 12, 31), periods=n_days)
+    symbols = [f"S{i:03d}" for i in range(n_symbols)]
+
+    market = rng.normal(0.0003, 0.009, size=n_days)
+    betas = rng.uniform(0.5, 1.5, size=n_symbols)
+    idio = rng.normal(0.0, 0.012, size=(n_days, n_symbols))
+    returns = market[:, None] * betas + idio
+    prices = 100.0 * np.exp(np.cumsum(returns, axis=0))
+
+    # Late listings for 10% of names, random suspensions for everyone
+    present = rng.random((n_days, n_symbols)) > 0.02
+    for j in rng.choice(n_symbols, max(n_symbols // 10, 1), replace=False):
+        present[: rng.integers(n_days // 4, n_days // 2), j] = False
+
+    masi = 10000.0 * np.exp(np.cumsum(market))
+    with engine.begin() as conn:
+        conn.execute(insert(StockInfo), [
+            {"symbol": s, "name": f"Synthetic {s}", "sector": f"Sector {i % 8}", "currency": "MAD"}
+            for i, s in enumerate(symbols)
+        ])
+        conn.execute(insert(MarketIndex), [
+            {"index_name": "MASI", "date": d.to_pydatetime(), "value": float(v)}
+            for d, v in zip(dates, masi)
+        ])
+        rows = []
+        for j, symbol in enumerate(symbols):
+            for t in np.flatnonzero(present[:, j]):
+                close = float(prices[t, j])
+                rows.append({
+                    "symbol": symbol,
+                    "date": dates[t].to_pydatetime(),
+                    "open": close, "high": close, "low": close, "close": close,
+                    "volume": int(rng.integers(100, 10000)),
+                    "adjusted_close": close,
+                })
+            if len(rows) > 50000:
+                conn.execute(insert(StockPrice), rows)
+                rows = []
+        if rows:
+            conn.execute(insert(StockPrice), rows)
+        conn.execute(insert(DataVersion), [
+            {"name": "stock_prices", "version": 1},
+            {"name": "stock_info", "version": 1},
+        ])
+    engine.dispose()
+    return symbols
+
+
+# ---------------------------------------------------------------------------
+# Request mix
+# ---------------------------------------------------------------------------
+
+class RequestFactory:
+    """Builds randomized but realistic requests for each endpoint"""
+
+    def __init__(self, symbols: List[str], min_assets: int, max_assets: int, seed: int):
+        self.symbols = symbols
+        self.min_assets = min(min_assets, len(symbols))
+        self.max_assets = min(max_assets, len(symbols))
+        self.rng = random.Random(seed)
+
+    def _symbols(self) -> List[str]:
+        return self.rng.sample(self.symbols, self.rng.randint(self.min_assets, self.max_assets))
+
+    def build(self, name: str):
+        """Return (method, path, params, json body)"""
+        if name == "job":
+            job_type = self.rng.choices(list(JOB_MIX), list(JOB_MIX.values()))[0]
+            inner = {
+                "efficient_frontier": "resampled_frontier",
+                "portfolio_analytics": "analytics",
+                "hrp": "hrp",
+            }[job_type]
+            _, _, _, payload = self.build(inner)
+            return "POST", ENDPOINTS[name], None, {"type": job_type, "payload": payload}
+
+        if name == "history":
+            symbol = self.rng.choice(self.symbols)
+            params = {"points": self.rng.choice([200, 500, 1000])} if self.rng.random() < 0.7 else {"limit": 1000}
+            return "GET", ENDPOINTS[name].format(symbol=symbol), params, None
+
+        symbols = self._symbols()
+        lookback = self.rng.choice(LOOKBACKS)
+        if name == "efficient_frontier":
+            body = {
+                "symbols": symbols,
+                "num_points": self.rng.choice([20, 50]),
+                "lookback_period": lookback,
+                "max_weight": max(0.3, 1.5 / len(symbols)),
+            }
+        elif name == "resampled_frontier":
+            body = {
+                "symbols": symbols,
+                "num_points": 20,
+                "lookback_period": lookback,
+                "max_weight": max(0.3, 1.5 / len(symbols)),
+                "resampled": True,
+                "num_samples": self.rng.choice([50, 100]),
+                # A fresh seed per request so identical universes are not deduplicated as jobs
+                "seed": self.rng.randint(0, 2**31),
+            }
+        elif name == "analytics":
+            n_portfolios = self.rng.choice([10, 100, 1000])
+            weights = np.random.default_rng(self.rng.randint(0, 2**31)).dirichlet(np.ones(len(symbols)), n_portfolios)
+            body = {"symbols": symbols, "portfolios": weights.round(6).tolist(), "lookback_period": lookback}
+        else:
+            body = {
+                "symbols": symbols,
+                "lookback_period": lookback,
+                "max_weight": self.rng.choice([0.1, 0.2, 0.3]),
+                "use_ledoit_wolf": self.rng.random() < 0.8,
+            }
+            if name == "cvar":
+                body["alpha"] = self.rng.choice([0.01, 0.05])
+        return "POST", ENDPOINTS[name], None, body
+
+
+# ---------------------------------------------------------------------------
+# Load generation
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Sample:
+    """One completed request"""
+    endpoint: str
+    latency: float
+    status: int
+    error: Optional[str] = None
+
+
+async def _send(client: httpx.AsyncClient, factory: RequestFactory, name: str, scheduled: float) -> Sample:
+    method, path, params, body = factory.build(name)
+    try:
+        response = await client.request(method, path, params=params, json=body)
+        status, error = response.status_code, None
+        if status >= 400:
+            error = f"HTTP {status}"
+        elif name == "job":
+            status, error = await _wait_for_job(client, response.json()["job_id"])
+    except httpx.HTTPError as e:
+        status, error = 0, type(e).__name__
+    # Latency is measured from the scheduled start so queueing delay is counted
+    return Sample(name, time.perf_counter() - scheduled, status, error)
+
+
+async def _wait_for_job(client: httpx.AsyncClient, job_id: str):
+    """Poll a job until it finishes; its latency is submission to completion"""
+    deadline = time.perf_counter() + (client.timeout.read or 120.0)
+    while time.perf_counter() < deadline:
+        response = await client.get(f"/api/v1/jobs/{job_id}")
+        if response.status_code != 200:
+            return response.status_code, f"HTTP {response.status_code} while polling"
+        state = response.json()["status"]
+        if state == "completed":
+            return 200, None
+        if state == "failed":
+            return 200, "job failed"
+        await asyncio.sleep(JOB_POLL_INTERVAL)
+    return 200, "job timeout"
+
+
+async def run_closed_loop(client, factory, names, weights, concurrency: int, duration: float) -> List[Sample]:
+    """Fixed number of concurrent users, each sending back-to-back requests"""
+    samples: List[Sample] = []
+    deadline = time.perf_counter() + duration
+
+    async def user():
+        while time.perf_counter() < deadline:
+            name = factory.rng.choices(names, weights)[0]
+            samples.append(await _send(client, factory, name, time.perf_counter()))
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return samples
+
+
+async def run_open_loop(client, factory, names, weights, rate: float, duration: float) -> List[Sample]:
+    """Poisson arrivals at a fixed rate, independent of response times"""
+    tasks = []
+    start = time.perf_counter()
+    next_arrival = start
+    while next_arrival < start + duration:
+        delay = next_arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        name = factory.rng.choices(names, weights)[0]
+        tasks.append(asyncio.create_task(_send(client, factory, name, next_arrival)))
+        next_arrival += factory.rng.expovariate(rate)
+    return list(await asyncio.gather(*tasks))
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict[str, dict]:
+    """Throughput, latency percentiles (ms) and error rate per endpoint and overall"""
+    groups = defaultdict(list)
+    for sample in samples:
+        groups[sample.endpoint].append(sample)
+    groups["ALL"] = samples
+
+    report = {}
+    for name, group in groups.items():
+        if not group:
+            continue
+        latencies = np.array([s.latency for s in group]) * 1000.0
+        errors = [s for s in group if s.error]
+        report[name] = {
+            "requests": len(group),
+            "throughput_rps": len(group) / elapsed,
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+            "max_ms": float(latencies.max()),
+            "error_rate": len(errors) / len(group),
+            "errors": dict(Counter(e.error for e in errors)),
+        }
+    return report
+
+
+def print_report(report: Dict[str, dict], elapsed: float):
+    print("\n" + "="*96)
+    print(f"  Load test results ({elapsed:.1f}s)")
+    print("="*96)
+    print(f"{'endpoint':<20}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errors':>10}")
+    for name in sorted(report, key=lambda n: (n == "ALL", n)):
+        r = report[name]
+        print(
+            f"{name:<20}{r['requests']:>10}{r['throughput_rps']:>10.1f}{r['p50_ms']:>10.1f}"
+            f"{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['max_ms']:>10.1f}{r['error_rate']:>9.1%}"
+        )
+        for error, count in r["errors"].items():
+            print(f"{'':<20}  {error}: {count}")
+    print("="*96 + "\n")
+
+
+# ---------------------------------------------------------------------------
+# Server lifecycle
+# ---------------------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(db_path: Path, port: int, workers: int) -> subprocess.Popen:
+    """Start uvicorn against the synthetic database"""
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        JOB_QUEUE_BACKEND="local",
+        DEBUG="False",
+        SCRAPER_CACHE_DIR=str(db_path.parent / "http_cache"),
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+    )
+
+
+def wait_until_healthy(url: str, timeout: float = 60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{url}/api/health", timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Server at {url} did not become healthy within {timeout:.0f}s")
+
+
+async def run_load(url: str, factory: RequestFactory, mix: Dict[str, float], args):
+    """Warm up, then run the measured phase; returns (samples, elapsed seconds)"""
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+    limits = httpx.Limits(max_connections=max(args.concurrency, 100), max_keepalive_connections=max(args.concurrency, 100))
+    async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+        if args.warmup > 0:
+            await run_closed_loop(client, factory, names, weights, min(args.concurrency, 4), args.warmup)
+        started = time.perf_counter()
+        if args.rate:
+            samples = await run_open_loop(client, factory, names, weights, args.rate, args.duration)
+        else:
+            samples = await run_closed_loop(client, factory, names, weights, args.concurrency, args.duration)
+        return samples, time.perf_counter() - started
+
+
+def main():
+    """Main load test function"""
+    parser = argparse.ArgumentParser(description="Load test the Portfolio Optimizer Pro API")
+    parser.add_argument("--url", help="Target an existing instance instead of booting one")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent users (closed loop)")
+    parser.add_argument("--rate", type=float, help="Arrival rate in req/s (open loop, overrides --concurrency)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured duration in seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured warmup in seconds")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--workers", type=int, default=1, help="Uvicorn worker processes")
+    parser.add_argument("--symbols", type=int, default=60, help="Synthetic universe size")
+    parser.add_argument("--days", type=int, default=1500, help="Synthetic history length (business days)")
+    parser.add_argument("--min-assets", type=int, default=5)
+    parser.add_argument("--max-assets", type=int, default=40)
+    parser.add_argument("--mix", help="JSON endpoint weights, e.g. '{\"hrp\": 3, \"history\": 1}'")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    mix = json.loads(args.mix) if args.mix else DEFAULT_MIX
+    unknown = set(mix) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"Unknown endpoints in --mix: {sorted(unknown)}")
+    # The booted server uses the in-process job queue, which each uvicorn
+    # worker holds separately: a poll routed to another worker gets a 404
+    if not args.url and args.workers > 1 and mix.get("job", 0) > 0:
+        if args.mix:
+            parser.error("'job' traffic needs --workers 1 (or --url with a Redis-backed deployment)")
+        mix = {name: weight for name, weight in mix.items() if name != "job"}
+        print("⚠️  Dropping 'job' from the mix: the local job queue is not shared across workers")
+
+    server = None
+    with tempfile.TemporaryDirectory(prefix="opcvm-load-") as tmp:
+        if args.url:
+            url = args.url.rstrip("/")
+            with httpx.Client(base_url=url) as client:
+                symbols = [s["symbol"] for s in client.get("/api/v1/stocks", params={"limit": 5000}).json()["items"]]
+        else:
+            db_path = Path(tmp) / "load_test.db"
+            print(f"🧪 Building synthetic dataset ({args.symbols} symbols x {args.days} days)...")
+            symbols = build_synthetic_database(db_path, args.symbols, args.days, args.seed)
+            port = _free_port()
+            url = f"http://127.0.0.1:{port}"
+            print(f"🚀 Starting API on {url} with {args.workers} worker(s)...")
+            server = start_server(db_path, port, args.workers)
+
+        try:
+            wait_until_healthy(url)
+            factory = RequestFactory(symbols, args.min_assets, args.max_assets, args.seed)
+            mode = f"{args.rate} req/s open loop" if args.rate else f"{args.concurrency} concurrent users"
+            print(f"📈 Running {mode} for {args.duration:.0f}s (+{args.warmup:.0f}s warmup)...")
+            samples, elapsed = asyncio.run(run_load(url, factory, mix, args))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+    report = summarize(samples, elapsed)
+    print_report(report, elapsed)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+        print(f"📝 Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
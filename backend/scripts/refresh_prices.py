@@ -0,0 +1,43 @@
+"""
+Script to refresh stock prices from the Casablanca Stock Exchange
+Only fetches dates missing from the database
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging
+from app.database.models import StockInfo, SessionLocal, init_db
+from app.utils.scrapers import refresh_stock_prices
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main refresh function"""
+    init_db()
+
+    symbols = [s.upper() for s in sys.argv[1:]]
+    if not symbols:
+        db = SessionLocal()
+        try:
+            symbols = [row.symbol for row in db.query(StockInfo.symbol).all()]
+        finally:
+            db.close()
+
+    if not symbols:
+        print("❌ No symbols to refresh (pass symbols or import CSV data first)")
+        return
+
+    inserted = refresh_stock_prices(symbols)
+
+    print("\n" + "="*60)
+    print("✅ Refresh completed!")
+    for symbol, count in sorted(inserted.items()):
+        print(f"   {symbol}: {count} new rows")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Nightly refit of per-symbol GARCH(1,1) volatility models
+Run after refresh_prices.py; each fit starts from the previous night's parameters
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging
+import time
+from app.core.config import settings
+from app.database.models import StockInfo, SessionLocal, init_db
+from app.utils.volatility import refresh_volatility
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main refit function"""
+    init_db()
+
+    db = SessionLocal()
+    try:
+        symbols = [s.upper() for s in sys.argv[1:]]
+        if not symbols:
+            symbols = [row.symbol for row in db.query(StockInfo.symbol).order_by(StockInfo.symbol).all()]
+        if not symbols:
+            print("❌ No symbols to fit (pass symbols or import CSV data first)")
+            return
+
+        started = time.perf_counter()
+        fitted, fit = refresh_volatility(
+            db,
+            symbols,
+            settings.VOLATILITY_LOOKBACK_DAYS,
+            min_observations=settings.VOLATILITY_MIN_OBSERVATIONS,
+            workers=settings.VOLATILITY_WORKERS or None
+        )
+        db.commit()
+        elapsed = time.perf_counter() - started
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    forecast = fit.forecast_volatility()
+    print("\n" + "="*60)
+    print(f"✅ Fitted {len(fitted)}/{len(symbols)} symbols in {elapsed:.1f}s")
+    for i, symbol in enumerate(fitted):
+        print(
+            f"   {symbol}: α={fit.alpha[i]:.3f} β={fit.beta[i]:.3f} "
+            f"annualized vol={forecast[i] * 252 ** 0.5:.1%}"
+        )
+    skipped = sorted(set(symbols) - set(fitted))
+    if skipped:
+        print(f"⚠️  Skipped (fewer than {settings.VOLATILITY_MIN_OBSERVATIONS} returns): {', '.join(skipped)}")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
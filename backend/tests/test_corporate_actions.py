@@ -0,0 +1,82 @@
+"""
+Corporate action adjustment tests
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import sessionmaker
+
+from app.database.engine import build_engine
+from app.database.models import Base, CorporateAction, DataVersion, StockPrice
+from app.utils.corporate_actions import apply_pending_adjustments, compute_adjusted_close
+
+
+def _prices():
+    dates = pd.bdate_range("2024-01-01", periods=6)
+    return pd.DataFrame({
+        "symbol": ["AAA"] * 6 + ["BBB"] * 6,
+        "date": list(dates) * 2,
+        "close": [100.0, 102.0, 98.0, 99.0, 100.0, 101.0, 50.0, 52.0, 26.0, 27.0, 28.0, 29.0],
+    })
+
+
+def test_dividend_and_split_factors():
+    """Test backward adjustment for a dividend on one symbol and a split on another"""
+    prices = _prices()
+    actions = pd.DataFrame({
+        "symbol": ["AAA", "BBB"],
+        "ex_date": pd.to_datetime(["2024-01-03", "2024-01-03"]),
+        "action_type": ["dividend", "split"],
+        "amount": [2.04, np.nan],
+        "ratio": [np.nan, 2.0],
+    })
+    adjusted = compute_adjusted_close(prices, actions)
+
+    dividend_factor = 1.0 - 2.04 / 102.0
+    assert np.allclose(adjusted[:2], np.array([100.0, 102.0]) * dividend_factor)
+    assert np.allclose(adjusted[2:6], prices["close"][2:6])
+    assert np.allclose(adjusted[6:8], [25.0, 26.0])
+    assert np.allclose(adjusted[8:], prices["close"][8:])
+
+
+def test_no_actions_returns_close():
+    """Test symbols without events are left unadjusted"""
+    prices = _prices()
+    empty = pd.DataFrame(columns=["symbol", "ex_date", "action_type", "amount", "ratio"])
+    assert np.allclose(compute_adjusted_close(prices, empty), prices["close"])
+
+
+def test_only_pending_symbols_are_readjusted(tmp_path):
+    """Test new events re-adjust their symbol and leave others untouched"""
+    engine = build_engine(f"sqlite:///{tmp_path / 'actions.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    for row in _prices().itertuples():
+        db.add(StockPrice(
+            symbol=row.symbol, date=row.date.to_pydatetime(), open=row.close, high=row.close,
+            low=row.close, close=row.close, volume=0, adjusted_close=row.close
+        ))
+    db.add(CorporateAction(symbol="BBB", ex_date=datetime(2024, 1, 3), action_type="split", ratio=2.0))
+    db.add(CorporateAction(symbol="AAA", ex_date=datetime(2025, 1, 3), action_type="dividend", amount=1.0))
+    db.commit()
+
+    # Only BBB has an event that has gone ex, and only its two pre-split rows change
+    assert apply_pending_adjustments(db) == 2
+    db.commit()
+    version = db.get(DataVersion, "stock_prices").version
+
+    bbb = [p.adjusted_close for p in db.query(StockPrice).filter_by(symbol="BBB").order_by(StockPrice.date)]
+    aaa = [p.adjusted_close for p in db.query(StockPrice).filter_by(symbol="AAA").order_by(StockPrice.date)]
+    assert np.allclose(bbb[:2], [25.0, 26.0])
+    assert np.allclose(aaa, _prices()["close"][:6])
+    # The future dividend has not gone ex yet and stays pending
+    assert db.query(CorporateAction).filter_by(symbol="AAA").one().applied_at is None
+    assert db.query(CorporateAction).filter_by(symbol="BBB").one().applied_at is not None
+
+    # Nothing new: no rewrite and no ETag invalidation on the next refresh
+    assert apply_pending_adjustments(db) == 0
+    assert apply_pending_adjustments(db, extra_symbols=["BBB"]) == 0
+    db.commit()
+    assert db.get(DataVersion, "stock_prices").version == version
+    db.close()
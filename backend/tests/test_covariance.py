@@ -0,0 +1,76 @@
+"""
+Missing-data aware returns and covariance tests
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import sessionmaker
+
+from app.database.engine import build_engine
+from app.database.models import Base, MarketIndex, StockPrice
+from app.utils.covariance_estimator import CovarianceEstimator, nearest_psd
+from app.utils.returns_builder import align_returns, trading_calendar
+
+
+def _returns_with_gaps(seed=0):
+    rng = np.random.default_rng(seed)
+    returns = pd.DataFrame(rng.normal(0, 0.01, size=(300, 5)), columns=list("ABCDE"))
+    returns.iloc[:120, 0] = np.nan  # late listing
+    returns.iloc[150:170, 2] = np.nan  # suspension
+    returns.iloc[rng.choice(300, 30, replace=False), 4] = np.nan  # sparse gaps
+    return returns
+
+
+def test_sample_matches_pandas_on_complete_data():
+    """Test complete data reproduces returns.cov()"""
+    returns = _returns_with_gaps().dropna()
+    estimate = CovarianceEstimator.estimate_sample(returns)
+    assert np.allclose(estimate.values, returns.cov().values)
+
+
+def test_pairwise_complete_matches_pandas():
+    """Test masked matrix products match pandas' pairwise-complete covariance"""
+    returns = _returns_with_gaps()
+    estimate = CovarianceEstimator.estimate_sample(returns)
+    assert np.allclose(estimate.values, returns.cov().values)
+    assert np.allclose(CovarianceEstimator.estimate_mean(returns).values, returns.mean().values)
+
+
+def test_nearest_psd_repairs_indefinite_matrix():
+    """Test PSD repair clips negative eigenvalues and keeps variances"""
+    cov = np.array([[1.0, 0.9, -0.9], [0.9, 1.0, 0.9], [-0.9, 0.9, 1.0]])
+    repaired = nearest_psd(cov)
+    assert np.linalg.eigvalsh(repaired).min() >= -1e-12
+    assert np.allclose(np.diag(repaired), 1.0)
+
+
+def test_align_returns_masks_unobserved_days():
+    """Test returns are only observed when both sessions traded"""
+    calendar = pd.DatetimeIndex(pd.bdate_range("2024-01-01", periods=5), name="date")
+    prices = pd.DataFrame(
+        {"ATW": [100.0, 101.0, np.nan, 103.0, 104.0], "NEW": [np.nan, np.nan, 50.0, 51.0, 52.0]},
+        index=calendar
+    ).drop(calendar[2])  # ATW suspended on day 3
+
+    aligned = align_returns(prices, calendar)
+    assert aligned.mask["ATW"].tolist() == [True, False, False, True]
+    assert aligned.mask["NEW"].tolist() == [False, False, False, True]
+    assert np.isclose(aligned.returns["ATW"].iloc[-1], 104.0 / 103.0 - 1.0)
+
+
+def test_calendar_extends_past_last_index_date(tmp_path):
+    """Test prices loaded after the last index date stay on the calendar"""
+    engine = build_engine(f"sqlite:///{tmp_path / 'calendar.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    days = [datetime(2024, 1, 1) + timedelta(days=i) for i in range(5)]
+    for day in days[:3]:
+        db.add(MarketIndex(index_name="MASI", date=day, value=12000.0))
+    for day in days:
+        db.add(StockPrice(symbol="ATW", date=day, open=1, high=1, low=1, close=1, volume=0))
+    db.commit()
+
+    assert list(trading_calendar(db)) == days
+    assert list(trading_calendar(db, start=days[1])) == days[1:]
+    db.close()
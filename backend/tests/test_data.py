@@ -0,0 +1,99 @@
+"""
+Market data endpoint tests
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.database.engine import build_engine, build_async_engine
+from app.database.models import Base, StockInfo, StockPrice, bump_data_version, get_async_db
+from app.utils.downsampling import lttb_indices
+
+
+@pytest.fixture
+def client(tmp_path):
+    url = f"sqlite:///{tmp_path / 'data.db'}"
+    engine = build_engine(url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(StockInfo(symbol="ATW", name="Attijariwafa Bank", sector="Banking"))
+    start = datetime(2020, 1, 1)
+    for i in range(1000):
+        db.add(StockPrice(
+            symbol="ATW", date=start + timedelta(days=i),
+            open=100, high=101, low=99, close=100 + np.sin(i / 20), volume=10,
+            adjusted_close=(100 + np.sin(i / 20)) * 0.9 if i < 500 else None
+        ))
+    bump_data_version(db, "stock_prices")
+    db.commit()
+    db.close()
+
+    session_factory = async_sessionmaker(build_async_engine(url, read_only=True), expire_on_commit=False)
+
+    async def override():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = override
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_history_keyset_pagination(client):
+    """Test pages follow each other without gaps or overlap"""
+    first = client.get("/api/v1/stocks/ATW/history", params={"limit": 600}).json()
+    second = client.get(
+        "/api/v1/stocks/ATW/history",
+        params={"limit": 600, "after": first["next_cursor"]}
+    ).json()
+
+    assert len(first["points"]) == 600
+    assert len(second["points"]) == 400
+    assert second["next_cursor"] is None
+    assert second["points"][0]["date"] > first["points"][-1]["date"]
+
+
+def test_history_downsampling(client):
+    """Test charts receive the requested number of points"""
+    body = client.get("/api/v1/stocks/ATW/history", params={"points": 200}).json()
+    assert body["downsampled"]
+    assert len(body["points"]) == 200
+
+
+def test_downsampled_points_match_paginated_fields(client):
+    """Test charts get the same close and adjusted_close fields as paginated history"""
+    full = client.get("/api/v1/stocks/ATW/history", params={"limit": 1000}).json()["points"]
+    chart = client.get("/api/v1/stocks/ATW/history", params={"points": 100}).json()["points"]
+    by_date = {point["date"]: point for point in full}
+    for point in chart:
+        assert point["close"] == by_date[point["date"]]["close"]
+        assert point["adjusted_close"] == by_date[point["date"]]["adjusted_close"]
+
+
+def test_history_etag_not_modified(client):
+    """Test a matching If-None-Match returns 304"""
+    response = client.get("/api/v1/stocks/ATW/history", params={"points": 50})
+    etag = response.headers["ETag"]
+    cached = client.get("/api/v1/stocks/ATW/history", params={"points": 50}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+
+def test_unknown_symbol_returns_404(client):
+    """Test missing symbols are reported"""
+    assert client.get("/api/v1/stocks/XXX/history").status_code == 404
+
+
+def test_lttb_keeps_extremes():
+    """Test LTTB keeps endpoints and the peak of a spike"""
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[500] = 10.0
+    keep = lttb_indices(x, y, 20)
+    assert len(keep) == 20
+    assert keep[0] == 0 and keep[-1] == 999
+    assert 500 in keep
@@ -0,0 +1,35 @@
+"""
+Database engine tests
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.database.engine import build_engine, to_async_url
+
+
+def test_sqlite_writer_uses_wal(tmp_path):
+    """Test writer connections switch the file to WAL"""
+    engine = build_engine(f"sqlite:///{tmp_path / 'wal.db'}")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+
+
+def test_sqlite_reader_rejects_writes(tmp_path):
+    """Test read-only pool cannot modify the database"""
+    url = f"sqlite:///{tmp_path / 'ro.db'}"
+    writer = build_engine(url)
+    with writer.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+
+    reader = build_engine(url, read_only=True)
+    with reader.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM t")).scalar() == 0
+        with pytest.raises(OperationalError):
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+
+
+def test_to_async_url():
+    """Test async driver mapping"""
+    assert to_async_url("sqlite:///./db.sqlite") == "sqlite+aiosqlite:///./db.sqlite"
+    assert to_async_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
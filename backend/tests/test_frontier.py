@@ -0,0 +1,72 @@
+"""
+Efficient frontier tests
+"""
+import numpy as np
+import pytest
+from app.utils import frontier
+from app.utils.frontier import efficient_frontier, max_return_weights, resampled_frontier
+
+
+def _returns(seed=0, n_obs=120, n_assets=5):
+    rng = np.random.default_rng(seed)
+    return rng.normal(np.linspace(0.0002, 0.001, n_assets), np.linspace(0.005, 0.02, n_assets), size=(n_obs, n_assets))
+
+
+def test_frontier_is_monotone_and_feasible():
+    """Test frontier points are fully invested, bounded and ordered by return"""
+    returns = _returns()
+    mu, cov = returns.mean(axis=0), np.cov(returns, rowvar=False)
+    weights = efficient_frontier(mu, cov, num_points=10, max_weight=0.4)
+
+    assert weights.shape == (10, 5)
+    assert np.allclose(weights.sum(axis=1), 1.0)
+    assert weights.min() >= -1e-8 and weights.max() <= 0.4 + 1e-6
+    assert np.all(np.diff(weights @ mu) >= -1e-7)
+
+
+def test_max_return_weights_fill_best_assets():
+    """Test the greedy maximum-return portfolio"""
+    weights = max_return_weights(np.array([0.1, 0.3, 0.2]), 0.0, 0.6)
+    assert np.allclose(weights, [0.0, 0.6, 0.4])
+
+
+def test_infeasible_bounds_rejected():
+    """Test bounds that cannot sum to one are rejected"""
+    with pytest.raises(ValueError):
+        efficient_frontier(np.zeros(3), np.eye(3), num_points=5, max_weight=0.2)
+
+
+def test_resampled_frontier_is_deterministic_across_workers():
+    """Test the same seed gives the same frontier in-process and in a pool"""
+    returns = _returns()
+    serial = resampled_frontier(returns, num_points=5, num_samples=8, seed=7, workers=1)
+    parallel = resampled_frontier(returns, num_points=5, num_samples=8, seed=7, workers=2)
+
+    assert serial.shape == (5, 5)
+    assert np.allclose(serial.sum(axis=1), 1.0)
+    assert np.allclose(serial, parallel, atol=1e-7)
+    again = resampled_frontier(returns, num_points=5, num_samples=8, seed=7, workers=1)
+    assert np.allclose(serial, again, atol=1e-7)
+
+
+def test_small_resamples_reuse_the_pool():
+    """Test fewer samples than workers keeps the shared pool and its solvers"""
+    returns = _returns()
+    resampled_frontier(returns, num_points=5, num_samples=8, seed=7, workers=2)
+    pool = frontier._pool
+    few = resampled_frontier(returns, num_points=5, num_samples=1, seed=7, workers=2)
+
+    assert frontier._pool is pool
+    assert np.allclose(few, resampled_frontier(returns, num_points=5, num_samples=1, seed=7, workers=1), atol=1e-7)
+
+
+def test_resampled_frontier_reports_progress():
+    """Test progress is reported per chunk and reaches completion"""
+    reports = []
+    resampled_frontier(
+        _returns(), num_points=3, num_samples=8, seed=1, workers=1,
+        progress=lambda fraction, message: reports.append(fraction)
+    )
+    assert len(reports) > 1
+    assert reports == sorted(reports)
+    assert reports[-1] == 1.0
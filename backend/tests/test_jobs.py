@@ -0,0 +1,163 @@
+"""
+Job queue tests (local backend, Redis backend on fakeredis)
+"""
+import json
+import time
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.jobs import JobStatus, LocalJobQueue, RedisJobQueue, get_job_queue
+from app.jobs import tasks
+from app.jobs.worker import process_job, start_local_workers
+
+
+def test_identical_jobs_are_deduplicated():
+    """Test identical in-flight submissions share one job"""
+    queue = LocalJobQueue()
+    first = queue.submit("hrp", {"symbols": ["ATW", "BCP"]})
+    second = queue.submit("hrp", {"symbols": ["ATW", "BCP"]})
+    other = queue.submit("hrp", {"symbols": ["ATW", "IAM"]})
+
+    assert first.job_id == second.job_id
+    assert other.job_id != first.job_id
+    assert queue.claim(timeout=0).job_id == first.job_id
+    assert queue.claim(timeout=0).job_id == other.job_id
+    assert queue.claim(timeout=0) is None
+
+
+def test_job_lifecycle_and_expiry():
+    """Test progress, result storage and result expiry"""
+    queue = LocalJobQueue(result_ttl=1)
+    job = queue.submit("stress_test", {"symbols": ["ATW"]})
+    reported = []
+
+    def handler(job_type, payload, progress):
+        progress(0.5, "halfway")
+        running = queue.get(job.job_id)
+        reported.append((running.status, running.progress, running.message))
+        return {"symbols": payload["symbols"]}
+
+    process_job(queue, queue.claim(timeout=0), handler)
+    assert reported == [(JobStatus.RUNNING, 0.5, "halfway")]
+    finished = queue.get(job.job_id)
+    assert finished.status == JobStatus.COMPLETED
+    assert finished.progress == 1.0
+    assert finished.result == {"symbols": ["ATW"]}
+
+    time.sleep(1.05)
+    assert queue.get(job.job_id) is None
+
+
+def test_failed_job_can_be_resubmitted():
+    """Test failed jobs are queued again on resubmission"""
+    queue = LocalJobQueue()
+    job = queue.submit("cvar", {"symbols": ["ATW"]})
+
+    def handler(job_type, payload, progress):
+        raise ValueError("boom")
+
+    process_job(queue, queue.claim(timeout=0), handler)
+    assert queue.get(job.job_id).status == JobStatus.FAILED
+    assert queue.get(job.job_id).error == "boom"
+
+    assert queue.submit("cvar", {"symbols": ["ATW"]}).status == JobStatus.QUEUED
+
+
+def test_run_job_passes_progress_to_long_running_methods(monkeypatch):
+    """Test service methods that accept a progress callback receive the job's"""
+    class Service:
+        async def calculate_efficient_frontier(self, request, progress=None):
+            progress(0.5, "halfway")
+            return {}
+
+    monkeypatch.setattr(tasks, "_service", Service())
+    reports = []
+    tasks.run_job("efficient_frontier", {"symbols": ["ATW", "BCP"]}, lambda p, m=None: reports.append((p, m)))
+    assert reports == [(0.0, "started"), (0.5, "halfway")]
+
+
+def _redis_queue(**kwargs):
+    return RedisJobQueue(fakeredis.FakeRedis(decode_responses=True), name="test:jobs", **kwargs)
+
+
+def _stall(queue, job_id, seconds=600):
+    """Pretend the worker running `job_id` stopped heartbeating `seconds` ago"""
+    queue.redis.hset(queue._job_key(job_id), "updated_at", json.dumps(time.time() - seconds))
+
+
+def test_redis_dead_worker_job_is_requeued_then_failed():
+    """Test running jobs without heartbeat are requeued, then failed after max attempts"""
+    queue = _redis_queue(visibility_timeout=60, max_attempts=2)
+    job = queue.submit("hrp", {"symbols": ["ATW", "BCP"]})
+    assert queue.claim(timeout=0.01).attempts == 1
+    assert queue.requeue_stale() == 0
+
+    _stall(queue, job.job_id)
+    assert queue.requeue_stale() == 1
+    assert queue.get(job.job_id).status == JobStatus.QUEUED
+    assert queue.redis.llen(queue._processing_key) == 0
+
+    assert queue.claim(timeout=0.01).attempts == 2
+    _stall(queue, job.job_id)
+    assert queue.requeue_stale() == 1
+    failed = queue.get(job.job_id)
+    assert failed.status == JobStatus.FAILED
+    assert "Worker lost" in failed.error
+    assert queue.claim(timeout=0.01) is None
+
+
+def test_redis_heartbeat_keeps_job_claimed():
+    """Test a heartbeating job is left to its worker"""
+    queue = _redis_queue(visibility_timeout=60)
+    job = queue.submit("hrp", {"symbols": ["ATW"]})
+    queue.claim(timeout=0.01)
+    _stall(queue, job.job_id)
+    queue.heartbeat(job.job_id)
+    assert queue.requeue_stale() == 0
+    assert queue.get(job.job_id).status == JobStatus.RUNNING
+
+
+def test_redis_submit_replaces_dead_running_job():
+    """Test resubmitting a job whose worker died queues it again"""
+    queue = _redis_queue(visibility_timeout=60)
+    payload = {"symbols": ["ATW"]}
+    job = queue.submit("cvar", payload)
+    queue.claim(timeout=0.01)
+    assert queue.submit("cvar", payload).status == JobStatus.RUNNING
+
+    _stall(queue, job.job_id)
+    assert queue.submit("cvar", payload).status == JobStatus.QUEUED
+    assert queue.redis.llen(queue._processing_key) == 0
+    assert queue.claim(timeout=0.01).job_id == job.job_id
+
+
+@pytest.fixture
+def client():
+    queue = LocalJobQueue()
+    stop_event = start_local_workers(queue, 1)
+    app.dependency_overrides[get_job_queue] = lambda: queue
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    stop_event.set()
+
+
+def test_submit_and_poll_job(client):
+    """Test submitting a job through the API and polling its result"""
+    response = client.post("/api/v1/jobs", json={"type": "stress_test", "payload": {"symbols": ["ATW"]}})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    for _ in range(50):
+        job = client.get(f"/api/v1/jobs/{job_id}").json()
+        if job["status"] == "completed":
+            break
+        time.sleep(0.1)
+    assert job["status"] == "completed"
+    assert job["result"] == {}
+
+
+def test_submit_rejects_invalid_payload(client):
+    """Test payloads are validated before being queued"""
+    response = client.post("/api/v1/jobs", json={"type": "hrp", "payload": {}})
+    assert response.status_code == 422
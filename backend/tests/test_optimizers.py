@@ -0,0 +1,91 @@
+"""
+Solver-free allocation tests
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from app.utils.optimizers import HRPOptimizer, RiskParityOptimizer, _bound_weights
+
+
+def _random_returns(n_assets=12, n_obs=500, seed=0):
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(0, 0.01, size=(n_obs, 3))
+    loadings = rng.uniform(0.2, 1.5, size=(3, n_assets))
+    noise = rng.normal(0, 0.01, size=(n_obs, n_assets))
+    return pd.DataFrame(factors @ loadings + noise, columns=[f"S{i}" for i in range(n_assets)])
+
+
+def test_hrp_weights_are_long_only_and_cached():
+    """Test HRP produces a fully invested long-only portfolio and reuses its cluster tree"""
+    returns = _random_returns()
+    optimizer = HRPOptimizer()
+    weights, _, volatility = optimizer.optimize(returns)
+
+    assert np.isclose(weights.sum(), 1.0)
+    assert (weights > 0).all()
+    assert volatility > 0
+
+    optimizer.optimize(returns)
+    assert len(optimizer._order_cache) == 1
+
+
+def test_hrp_respects_max_weight():
+    """Test HRP weights are capped when the bound is feasible"""
+    weights, _, _ = HRPOptimizer().optimize(_random_returns(), constraints={'max_weight': 0.1})
+    assert np.isclose(weights.sum(), 1.0)
+    assert weights.max() <= 0.1 + 1e-9
+
+
+def test_hrp_respects_min_and_max_weight():
+    """Test both bounds hold together and renormalization does not undo the floor"""
+    weights, _, _ = HRPOptimizer().optimize(
+        _random_returns(n_assets=5), constraints={'max_weight': 0.3, 'min_weight': 0.1}
+    )
+    assert np.isclose(weights.sum(), 1.0)
+    assert weights.min() >= 0.1 - 1e-9
+    assert weights.max() <= 0.3 + 1e-9
+
+    bounded = _bound_weights(np.array([0.98, 0.01, 0.01]), 1.0, 0.2)
+    assert np.allclose(bounded, [0.6, 0.2, 0.2])
+
+
+def test_infeasible_bounds_are_rejected():
+    """Test HRP and risk parity refuse bounds that cannot sum to one"""
+    returns = _random_returns(n_assets=5)
+    with pytest.raises(ValueError):
+        HRPOptimizer().optimize(returns, constraints={'max_weight': 0.1})
+    with pytest.raises(ValueError):
+        RiskParityOptimizer().optimize(returns, constraints={'min_weight': 0.3})
+
+
+def test_risk_parity_applies_bounds():
+    """Test risk parity weights are projected onto the weight bounds"""
+    weights, _, _ = RiskParityOptimizer().optimize(
+        _random_returns(), constraints={'max_weight': 0.09, 'min_weight': 0.07}
+    )
+    assert np.isclose(weights.sum(), 1.0)
+    assert weights.min() >= 0.07 - 1e-9
+    assert weights.max() <= 0.09 + 1e-9
+
+
+def test_risk_parity_equalizes_contributions():
+    """Test ERC risk contributions are equal"""
+    returns = _random_returns()
+    cov = returns.cov().values
+    weights = RiskParityOptimizer().allocate(cov)
+
+    contributions = RiskParityOptimizer.risk_contributions(weights, cov)
+    assert np.isclose(weights.sum(), 1.0)
+    assert np.allclose(contributions, 1.0 / len(weights), atol=1e-6)
+
+
+def test_risk_parity_coordinate_descent_matches_newton():
+    """Test the coordinate descent fallback reaches the same solution"""
+    cov = _random_returns(n_assets=6).cov().values
+    optimizer = RiskParityOptimizer()
+    budgets = np.full(6, 1.0 / 6)
+    y0 = 1.0 / np.sqrt(np.diag(cov))
+
+    newton = optimizer._newton(cov, budgets, y0.copy())
+    ccd = optimizer._coordinate_descent(cov, budgets, y0.copy())
+    assert np.allclose(newton / newton.sum(), ccd / ccd.sum(), atol=1e-6)
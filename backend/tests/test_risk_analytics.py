@@ -0,0 +1,94 @@
+"""
+Batched risk analytics tests
+"""
+import asyncio
+import warnings
+
+import numpy as np
+import pandas as pd
+from app.api.models.optimization import PortfolioAnalyticsRequest, PortfolioRiskMetrics
+from app.api.services.optimization_service import OptimizationService
+from app.utils.risk_analytics import batch_risk_metrics, scenario_var_cvar
+
+
+def _setup(seed=0, n_assets=8, n_obs=400, n_portfolios=50):
+    rng = np.random.default_rng(seed)
+    scenarios = rng.normal(0.0005, 0.01, size=(n_obs, n_assets))
+    weights = rng.dirichlet(np.ones(n_assets), size=n_portfolios)
+    return scenarios, np.cov(scenarios, rowvar=False), scenarios.mean(axis=0), weights
+
+
+def test_batch_matches_single_portfolio_formulas():
+    """Test stacked results equal the per-portfolio definitions"""
+    scenarios, cov, mean, weights = _setup()
+    metrics = batch_risk_metrics(weights, cov, mean, scenarios=scenarios)
+
+    for i, w in enumerate(weights):
+        volatility = np.sqrt(w @ cov @ w)
+        assert np.isclose(metrics.volatility[i], volatility)
+        assert np.isclose(metrics.expected_return[i], w @ mean)
+        assert np.isclose(metrics.hhi[i], np.sum(w ** 2))
+        assert np.isclose(metrics.diversification_ratio[i], w @ np.sqrt(np.diag(cov)) / volatility)
+        assert np.allclose(metrics.marginal_risk[i], cov @ w / volatility)
+
+
+def test_risk_contributions_sum_to_volatility():
+    """Test Euler decomposition of volatility"""
+    scenarios, cov, mean, weights = _setup()
+    metrics = batch_risk_metrics(weights, cov, mean)
+    assert np.allclose(metrics.risk_contributions.sum(axis=1), metrics.volatility)
+    assert np.isnan(metrics.var).all()
+
+
+def test_var_cvar_from_worst_scenarios():
+    """Test historical VaR/CVaR on a known distribution of outcomes"""
+    pnl = np.arange(-10, 90, dtype=float)[None, :] / 100.0  # 100 scenarios
+    var, cvar = scenario_var_cvar(pnl, alpha=0.05)
+    assert np.isclose(var[0], 0.06)
+    assert np.isclose(cvar[0], 0.08)
+
+
+def test_chunking_does_not_change_results():
+    """Test scenario blocks give the same VaR as one pass"""
+    scenarios, cov, mean, weights = _setup()
+    whole = batch_risk_metrics(weights, cov, mean, scenarios=scenarios)
+    chunked = batch_risk_metrics(weights, cov, mean, scenarios=scenarios, chunk_size=7)
+    assert np.allclose(whole.var, chunked.var)
+    assert np.allclose(whole.cvar, chunked.cvar)
+
+
+def test_zero_net_portfolio_has_no_hhi():
+    """Test a long/short book with zero net weight yields JSON-safe metrics"""
+    scenarios, cov, mean, _ = _setup(n_assets=4)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        metrics = batch_risk_metrics(np.array([[0.5, -0.5, 0.25, -0.25]]), cov, mean, scenarios=scenarios)
+
+    hhi = OptimizationService._finite(metrics.hhi[0])
+    assert hhi is None
+    assert PortfolioRiskMetrics(
+        expected_return=float(metrics.expected_return[0]),
+        volatility=float(metrics.volatility[0]),
+        hhi=hhi
+    ).model_dump_json()
+
+
+def test_gappy_returns_keep_every_scenario(monkeypatch):
+    """Test suspensions and a recent listing do not drop VaR scenarios"""
+    rng = np.random.default_rng(3)
+    lookback, n_assets = 252, 40
+    returns = pd.DataFrame(rng.normal(0.0005, 0.01, size=(lookback, n_assets)))
+    returns[rng.random(returns.shape) < 0.02] = np.nan
+    returns.iloc[:200, -1] = np.nan  # listed 52 days ago
+    assert len(returns.dropna()) < lookback // 5
+    monkeypatch.setattr(OptimizationService, "_load_returns", lambda self, symbols, lookback_period: returns)
+
+    request = PortfolioAnalyticsRequest(
+        symbols=[f"S{i}" for i in range(n_assets)],
+        portfolios=[[1.0 / n_assets] * n_assets],
+        lookback_period=lookback
+    )
+    response = asyncio.run(OptimizationService().analyze_portfolios(request))
+    assert response.num_scenarios == lookback
+    assert response.portfolios[0].var > 0
+    assert response.portfolios[0].cvar >= response.portfolios[0].var
@@ -0,0 +1,97 @@
+"""
+Market data fetcher tests against a local fixture HTTP server
+"""
+import asyncio
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.database.engine import build_engine
+from app.database.models import Base, StockPrice
+from app.utils.scrapers import AsyncFetcher, ResponseCache, StockHistoryFetcher
+
+HISTORY_CSV = (
+    b"Date,Open,High,Low,Close,Volume\n"
+    b"2024-01-02,100,101,99,100.5,1000\n"
+    b"2024-01-03,100.5,102,100,101.5,1200\n"
+    b"2024-01-04,101.5,103,101,102.0,900\n"
+)
+ETAG = '"history-v1"'
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        FixtureHandler.requests_seen.append(self.path)
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(HISTORY_CSV)))
+        self.end_headers()
+        self.wfile.write(HISTORY_CSV)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fixture_server():
+    FixtureHandler.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_conditional_request_uses_cache(fixture_server, tmp_path):
+    """Test a second fetch is answered by 304 and served from disk"""
+    cache = ResponseCache(str(tmp_path / "cache"))
+
+    async def fetch_twice():
+        async with AsyncFetcher(cache=cache, rate_limit_per_host=0) as fetcher:
+            first = await fetcher.fetch(f"{fixture_server}/history/ATW.csv")
+            second = await fetcher.fetch(f"{fixture_server}/history/ATW.csv")
+        return first, second
+
+    first, second = asyncio.run(fetch_twice())
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.status_code == 304
+    assert second.content == HISTORY_CSV
+
+
+def test_refresh_fetches_only_missing_symbols(fixture_server, tmp_path):
+    """Test symbols already up to date are not requested"""
+    engine = build_engine(f"sqlite:///{tmp_path / 'prices.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+
+    db = session_factory()
+    db.add(StockPrice(symbol="BCP", date=datetime(2024, 1, 4), open=1, high=1, low=1, close=1, volume=0))
+    db.add(StockPrice(symbol="IAM", date=datetime(2024, 1, 2), open=1, high=1, low=1, close=1, volume=0))
+    db.commit()
+    db.close()
+
+    fetcher = StockHistoryFetcher(
+        base_url=fixture_server,
+        session_factory=session_factory,
+        cache_dir=str(tmp_path / "cache"),
+        rate_limit_per_host=0
+    )
+    inserted = asyncio.run(fetcher.refresh(["ATW", "BCP", "IAM"], end=datetime(2024, 1, 4)))
+
+    assert inserted == {"ATW": 3, "BCP": 0, "IAM": 2}
+    assert sorted(p.split("?")[0] for p in FixtureHandler.requests_seen) == [
+        "/history/ATW.csv",
+        "/history/IAM.csv",
+    ]
@@ -0,0 +1,160 @@
+"""
+EWMA covariance and batched GARCH tests
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy.orm import sessionmaker
+
+from app.database.engine import build_engine
+from app.database.models import Base, StockPrice
+from app.utils.covariance_estimator import EWMACovariance, ewma_covariance
+from app.utils.volatility import (
+    _garch_likelihood,
+    fit_garch_batch,
+    load_garch_fits,
+    refresh_volatility,
+    save_garch_fits
+)
+
+
+def _simulate_garch(n_obs, omega, alpha, beta, seed=0):
+    rng = np.random.default_rng(seed)
+    n = len(omega)
+    returns = np.empty((n_obs, n))
+    variance = omega / (1.0 - alpha - beta)
+    for t in range(n_obs):
+        returns[t] = np.sqrt(variance) * rng.standard_normal(n)
+        variance = omega + alpha * returns[t] ** 2 + beta * variance
+    return returns
+
+
+def test_ewma_incremental_matches_full_history():
+    """Test one-day updates reproduce the full-history estimate, gaps included"""
+    rng = np.random.default_rng(1)
+    returns = rng.normal(0, 0.01, size=(200, 4))
+    returns[50:60, 1] = np.nan
+
+    state = EWMACovariance.from_returns(returns[:150], lam=0.94)
+    for row in returns[150:]:
+        state.update(row)
+    assert np.allclose(state.covariance, ewma_covariance(returns, lam=0.94))
+
+
+def test_ewma_matches_recursion_on_complete_data():
+    """Test the weighted Gram product equals the RiskMetrics recursion"""
+    rng = np.random.default_rng(2)
+    returns = rng.normal(0, 0.01, size=(100, 3))
+    lam = 0.9
+    cross = np.zeros((3, 3))
+    total = 0.0
+    for row in returns:
+        cross = lam * cross + np.outer(row, row)
+        total = lam * total + 1.0
+    assert np.allclose(ewma_covariance(returns, lam=lam), cross / total)
+
+
+def test_likelihood_gradient_matches_finite_differences():
+    """Test the analytic gradient of the vectorized recursion"""
+    returns = _simulate_garch(300, np.full(3, 1e-6), np.full(3, 0.08), np.full(3, 0.9))
+    mask = np.ones_like(returns, dtype=bool)
+    mask[100:110, 1] = False
+    r2 = np.where(mask, returns, 0.0) ** 2
+    long_run = r2.sum(axis=0) / mask.sum(axis=0)
+    s = np.array([0.9, 0.95, 0.97])
+    p = np.array([0.1, 0.05, 0.2])
+
+    _, grad_s, grad_p = _garch_likelihood(s, p, r2, mask, long_run)
+    h = 1e-6
+    up, _, _ = _garch_likelihood(s + h, p, r2, mask, long_run)
+    down, _, _ = _garch_likelihood(s - h, p, r2, mask, long_run)
+    assert np.allclose(grad_s, (up - down) / (2 * h), rtol=1e-4)
+    up, _, _ = _garch_likelihood(s, p + h, r2, mask, long_run)
+    down, _, _ = _garch_likelihood(s, p - h, r2, mask, long_run)
+    assert np.allclose(grad_p, (up - down) / (2 * h), rtol=1e-4)
+
+
+def test_batch_fit_recovers_parameters():
+    """Test simulated GARCH parameters are recovered for every asset"""
+    alpha = np.array([0.05, 0.08, 0.1, 0.12])
+    beta = np.array([0.92, 0.9, 0.85, 0.8])
+    omega = 1e-4 * (1.0 - alpha - beta)
+    returns = _simulate_garch(4000, omega, alpha, beta, seed=3)
+
+    fit = fit_garch_batch(returns, workers=1)
+    assert np.allclose(fit.alpha, alpha, atol=0.04)
+    assert np.allclose(fit.persistence, alpha + beta, atol=0.04)
+    assert np.all(fit.forecast_volatility() > 0)
+
+
+def test_parallel_and_warm_started_fits_agree():
+    """Test block splitting across processes and warm starts give the same fit"""
+    alpha = np.full(6, 0.08)
+    beta = np.full(6, 0.9)
+    returns = _simulate_garch(1500, 1e-4 * (1.0 - alpha - beta), alpha, beta, seed=4)
+    returns[:200, 5] = np.nan
+
+    serial = fit_garch_batch(returns, workers=1)
+    parallel = fit_garch_batch(returns, workers=2, block_size=2)
+    warm = fit_garch_batch(returns, start=serial, workers=1)
+    assert np.allclose(serial.persistence, parallel.persistence, atol=5e-3)
+    assert np.allclose(serial.persistence, warm.persistence, atol=5e-3)
+
+
+def test_update_rolls_filter_forward():
+    """Test a one-day update equals refiltering the extended history"""
+    alpha = np.full(2, 0.1)
+    beta = np.full(2, 0.85)
+    returns = _simulate_garch(600, 1e-4 * (1.0 - alpha - beta), alpha, beta, seed=5)
+    fit = fit_garch_batch(returns[:-1], workers=1)
+    rolled = fit.update(returns[-1])
+
+    variance = fit.long_run_variance.copy()
+    r2 = (returns - fit.mean) ** 2
+    for t in range(1, len(returns)):
+        variance = fit.omega + fit.alpha * r2[t - 1] + fit.beta * variance
+    assert np.allclose(rolled.last_variance, variance)
+    assert np.allclose(rolled.last_innovation, r2[-1])
+
+
+def test_fits_round_trip_through_database(tmp_path):
+    """Test stored fits load back in symbol order with NaN for unknown symbols"""
+    engine = build_engine(f"sqlite:///{tmp_path / 'vol.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    alpha = np.full(2, 0.08)
+    beta = np.full(2, 0.9)
+    returns = _simulate_garch(500, 1e-4 * (1.0 - alpha - beta), alpha, beta, seed=6)
+    fit = fit_garch_batch(returns, workers=1)
+    save_garch_fits(db, ["AAA", "BBB"], fit, datetime(2024, 6, 28), np.array([500, 500]))
+    save_garch_fits(db, ["AAA", "BBB"], fit, datetime(2024, 7, 1), np.array([500, 500]))
+    db.commit()
+
+    loaded = load_garch_fits(db, ["BBB", "NEW", "AAA"])
+    assert np.allclose(loaded.alpha[[2, 0]], fit.alpha)
+    assert np.allclose(loaded.last_variance[[2, 0]], fit.last_variance)
+    assert np.isnan(loaded.persistence[1])
+    db.close()
+
+
+def test_refresh_skips_symbols_without_prices(tmp_path):
+    """Test a symbol listed without prices does not abort the nightly refit"""
+    engine = build_engine(f"sqlite:///{tmp_path / 'refresh.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    returns = _simulate_garch(300, np.array([2e-6]), np.array([0.08]), np.array([0.9]), seed=7)[:, 0]
+    prices = 100.0 * np.cumprod(1.0 + returns)
+    dates = [datetime(2023, 1, 2) + timedelta(days=i) for i in range(len(prices))]
+    for date, price in zip(dates, prices):
+        db.add(StockPrice(
+            symbol="AAA", date=date, open=price, high=price, low=price, close=price, volume=0
+        ))
+    db.commit()
+
+    fitted, fit = refresh_volatility(db, ["AAA", "NEWCO"], lookback_period=500, min_observations=100)
+    db.commit()
+    assert fitted == ["AAA"]
+    assert np.isfinite(load_garch_fits(db, ["AAA"]).alpha).all()
+    db.close()